@@ -0,0 +1,246 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# AUTHORSHIP INFORMATION - THIS FILE BELONGS TO MARC-ANDRE VOYER HELPER FUNCTIONS CODEBASE
+
+__author__ = 'Marc-André Voyer'
+__copyright__ = 'Copyright (C) 2020-2026, Marc-André Voyer'
+__license__ = "MIT License"
+__maintainer__ = 'Marc-André Voyer'
+__email__ = 'marcandre.voyer@gmail.com'
+__status__ = 'Production'
+
+# ----------------------------------------------------------------------------------------------------------------------
+# IMPORTS
+
+
+"""
+asyncio front-end of fileUtils / zipUtils: the blocking file operations run on a dedicated thread pool, so they
+never stall the event loop (and a slow network copy does not hold up the other tasks).
+"""
+
+from typing import *
+from pathlib import Path
+import os
+import asyncio
+import threading
+import functools
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+
+# Common utilities
+from . import fileUtils
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# SETTINGS
+
+executor_workers: int = 8  # Size of the default executor (created on first use)
+scan_batch_size: int = 256  # Files handed over to the event loop at once by the async scans
+scan_queue_size: int = 16  # Batches a scan may list ahead of its consumer
+
+_executor: Optional[concurrent.futures.Executor] = None
+_executor_lock = threading.Lock()
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# CODE
+
+def set_executor(executor: Optional[concurrent.futures.Executor]):
+    """
+    Sets the executor the operations run on (None: a ThreadPoolExecutor of executor_workers, created on first use).
+    The previous executor is not shut down.
+    """
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+
+def get_executor() -> concurrent.futures.Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix='aioUtils')
+        return _executor
+
+
+async def run_blocking(func: Callable, *args, **kwargs):
+    """
+    Runs a blocking function on the executor and waits for its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def _threadsafe_callback(callback: Optional[Callable]) -> Optional[Callable]:
+    """
+    Wraps a callback so that, called from a worker thread, it runs on the event loop.
+    """
+    if callback is None:
+        return None
+    loop = asyncio.get_running_loop()
+    return lambda *args: loop.call_soon_threadsafe(callback, *args)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# SINGLE OPERATIONS
+
+async def copy_file(source: Union[str, Path], destination: Union[str, Path],
+                    progress_callback: Optional[Callable[[int], None]] = None) -> bool:
+    """
+    See fileUtils.copy_file. progress_callback is called on the event loop.
+    """
+    return await run_blocking(fileUtils.copy_file, source, destination, _threadsafe_callback(progress_callback))
+
+
+async def move_file(src: Union[str, Path], dest: Union[str, Path]) -> bool:
+    return await run_blocking(fileUtils.move_file, src, dest)
+
+
+async def delete_dir(dir_path: Union[str, Path]) -> bool:
+    return await run_blocking(fileUtils.delete_dir, dir_path)
+
+
+async def get_file_list_from_path(dir_name: Union[str, Path], recursive=True, filter_extension=None,
+                                  parallel: int = 0,
+                                  scan_filter: Optional[fileUtils.ScanFilter] = None) -> List[fileUtils.File]:
+    return await run_blocking(fileUtils.get_file_list_from_path, dir_name, recursive, filter_extension, parallel,
+                              scan_filter)
+
+
+async def unzip_file(source_file: Union[str, Path], destination_dir: Union[str, Path],
+                     pwd: Optional[str] = None) -> bool:
+    from . import zipUtils  # Optional dependencies (pyzipper, patoolib), only needed here
+    return await run_blocking(zipUtils.unzip_file, source_file, destination_dir, pwd)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# SCANS (ASYNC GENERATORS)
+
+async def iter_files(dir_name: Union[str, Path], recursive=True, filter_extension=None, parallel: int = 0,
+                     scan_filter: Optional[fileUtils.ScanFilter] = None) -> AsyncIterator[fileUtils.File]:
+    """
+    Async version of fileUtils.iter_files: files are yielded as the tree is listed (on the executor).
+    """
+    scan = functools.partial(fileUtils.iter_files, dir_name, recursive, filter_extension, parallel, scan_filter)
+    async for file_batch in _iterate_in_executor(lambda: _batched(scan(), scan_batch_size)):
+        for file in file_batch:
+            yield file
+
+
+async def iter_dir_listings(dir_name: Union[str, Path], recursive=True, parallel: int = 0,
+                            scan_filter: Optional[fileUtils.ScanFilter] = None
+                            ) -> AsyncIterator[Tuple[Path, List[os.DirEntry]]]:
+    """
+    Async version of fileUtils.iter_dir_listings.
+    """
+    async for listing in _iterate_in_executor(
+            functools.partial(fileUtils.iter_dir_listings, dir_name, recursive, parallel, scan_filter)):
+        yield listing
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _iterate_in_executor(iterable_factory: Callable[[], Iterable]) -> AsyncIterator:
+    """
+    Runs a blocking iterator on a thread of its own and yields its items on the event loop.
+    The producer stays at most scan_queue_size items ahead, and stops if the consumer does. It does not run on the
+    executor: waiting for its consumer, it would hold a worker the consumer's own operations may need.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=scan_queue_size)
+    stop_event = threading.Event()
+    end = object()
+
+    def put(item) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:  # Loop closed
+            return False
+        while True:
+            try:
+                future.result(timeout=0.1)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stop_event.is_set():
+                    future.cancel()
+                    return False
+            except concurrent.futures.CancelledError:  # Consumer cancelled / loop shutting down
+                return False
+
+    def produce():
+        try:
+            for item in iterable_factory():
+                if stop_event.is_set() or not put((item, None)):
+                    return
+        except BaseException as e:
+            put((end, e))
+        else:
+            put((end, None))
+        finally:
+            try:
+                loop.call_soon_threadsafe(lambda: producer.done() or producer.set_result(None))
+            except RuntimeError:  # Loop closed
+                pass
+
+    producer = loop.create_future()
+    threading.Thread(target=produce, name='aioUtils.scan', daemon=True).start()
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is end:
+                if error is not None:
+                    raise error
+                break
+            yield item
+    finally:
+        stop_event.set()
+        if not producer.done():
+            await asyncio.shield(producer)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# BATCH OPERATIONS
+
+async def run_many(func: Callable, args_lst: Iterable[tuple], limit: int = 4, return_exceptions: bool = True) -> list:
+    """
+    Runs a blocking function for each set of arguments, at most limit at a time, and returns the results in order.
+    :param return_exceptions: Return exceptions in the results instead of raising the first one
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(args: tuple):
+        async with semaphore:
+            return await run_blocking(func, *args)
+
+    return await asyncio.gather(*(run_one(tuple(args)) for args in args_lst), return_exceptions=return_exceptions)
+
+
+async def copy_files(pair_lst: Iterable[Tuple[Union[str, Path], Union[str, Path]]], limit: int = 4) -> List[bool]:
+    """
+    Copies (source, destination) pairs, at most limit at a time. Returns copy_file's result for each pair.
+    """
+    return await run_many(fileUtils.copy_file, pair_lst, limit)
+
+
+async def move_files(pair_lst: Iterable[Tuple[Union[str, Path], Union[str, Path]]], limit: int = 4) -> List[bool]:
+    return await run_many(fileUtils.move_file, pair_lst, limit)
+
+
+async def delete_dirs(dir_path_lst: Iterable[Union[str, Path]], limit: int = 4) -> List[bool]:
+    return await run_many(fileUtils.delete_dir, ((dir_path,) for dir_path in dir_path_lst), limit)
+
+
+async def unzip_files(pair_lst: Iterable[Tuple[Union[str, Path], Union[str, Path]]], limit: int = 2) -> List[bool]:
+    """
+    Extracts (zip file, destination folder) pairs, at most limit at a time.
+    """
+    from . import zipUtils
+    return await run_many(zipUtils.unzip_file, pair_lst, limit)
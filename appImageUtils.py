@@ -11,13 +11,20 @@ __status__ = 'Production'
 # ----------------------------------------------------------------------------------------------------------------------
 # IMPORTS
 
+from typing import *
 from pathlib import Path
+import os
 
 # Common utilities
 from . import fileUtils
 
 
 class AppImageFile(fileUtils.File):
-    def __init__(self, path: Path):
+    __slots__ = ()
+
+    def __init__(self, path: Path, stat_info: Union[os.stat_result, os.DirEntry, None] = None):
         # Call the parent (File) initializer
-        super().__init__(path)
+        super().__init__(path, stat_info)
+
+
+fileUtils.register_file_type(AppImageFile, extensions=['appimage'], magic=[b'AI\x01', b'AI\x02'], offset=8)
@@ -219,17 +219,24 @@ def config_add_variable(cfg_file_path: Union[str, Path], section: str, variable:
     new_lines_lst = []
 
     if section_is_there:
+        section_idx_lst = [i for i, ln in enumerate(lines_lst) if ln.strip() == section_line]
+        if len(section_idx_lst) == 1 and _has_same_line_index(file_cls, lines_lst, section_idx_lst[0]):
+            # Only shift what follows the section header
+            file_cls.replace_line_range(section_idx_lst[0] + 1, section_idx_lst[0] + 1, [variable_line_to_add])
+            return
         for ln in lines_lst:
             new_lines_lst.append(ln)
             if ln.strip() == section_line:
                 new_lines_lst.append(variable_line_to_add)
     else:
-        new_lines_lst = list(lines_lst)
+        # New section goes at the end: append without rewriting the file
         # If file has content and doesn't already end with a blank line, add a blank line before new section
-        if new_lines_lst and new_lines_lst[-1].strip() != "":
+        if lines_lst and lines_lst[-1].strip() != "":
             new_lines_lst.append("")
         new_lines_lst.append(section_line)
         new_lines_lst.append(variable_line_to_add)
+        file_cls.append_lines(new_lines_lst)
+        return
 
     file_cls.line_lst = new_lines_lst
     file_cls.write_lines()
@@ -254,6 +261,7 @@ def config_set_variable(cfg_file_path: Union[str, Path], section: str, variable:
 
     new_lines_lst = []
     replaced = False
+    replaced_idx = -1
 
     for ln in lines_lst:
         stripped = ln.strip()
@@ -274,14 +282,28 @@ def config_set_variable(cfg_file_path: Union[str, Path], section: str, variable:
                     sep = " = " if " = " in ln else "="
                     new_lines_lst.append(f"{variable}{sep}{value}")
                     replaced = True
+                    replaced_idx = len(new_lines_lst) - 1
                     continue
 
         new_lines_lst.append(ln)
 
+    if replaced and _has_same_line_index(cfg_file, lines_lst, replaced_idx):
+        # Only that line changes (overwritten in place when the value keeps its length)
+        cfg_file.replace_line_range(replaced_idx, replaced_idx + 1, [new_lines_lst[replaced_idx]])
+        return
+
     cfg_file.line_lst = new_lines_lst
     cfg_file.write_lines()
 
 
+def _has_same_line_index(txt_file: fileUtils.TXTFile, lines_lst: List[str], idx: int) -> bool:
+    """
+    Whether line numbers from read_lines() can be used for in-place edits (they can't if the file uses line
+    separators other than \\n / \\r\\n, which read_lines() also splits on).
+    """
+    return txt_file.line_count() == len(lines_lst) and txt_file.line(idx) == lines_lst[idx]
+
+
 def config_set_add_variable(cfg_file_path, section, variable, value):
     """
     Don't know if something is there already, add if not else set
@@ -23,9 +23,11 @@ from .debugUtils import *
 
 
 class DMGFile(fileUtils.File):
-    def __init__(self, path: Path):
+    __slots__ = ()
+
+    def __init__(self, path: Path, stat_info: Union[os.stat_result, os.DirEntry, None] = None):
         # Call the parent (File) initializer
-        super().__init__(path)
+        super().__init__(path, stat_info)
 
     def extract_directory_from_dmg(self, target_directory, output_dir):
         tool_name = 'DMG Directory Extractor'
@@ -71,3 +73,6 @@ class DMGFile(fileUtils.File):
         finally:
             # Step 4: Unmount the DMG
             subprocess.call(["hdiutil", "detach", mount_point])
+
+
+fileUtils.register_file_type(DMGFile, extensions=['dmg'])  # Signature (koly) is at the end, not sniffable
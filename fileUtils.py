@@ -12,10 +12,26 @@ __status__ = 'Production'
 # IMPORTS
 
 from typing import *
+import re
 import stat
+import fnmatch
+import mmap
+import codecs
+import errno
+import tempfile
+import hashlib
+import sqlite3
+import threading
 import subprocess
+import importlib
+from array import array
+from contextlib import contextmanager
+from enum import Enum
+from operator import add
+from itertools import accumulate, islice, repeat, chain
 from pathlib import Path
-from shutil import rmtree, copyfile, move
+from shutil import rmtree, copyfile, move, SameFileError
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 
 # Common utilities
 from .osUtils import *
@@ -28,18 +44,110 @@ match get_os():
         from . import junctionUtils
     case OS.LINUX:
         import pwd
+        import fcntl
 
 
 delete_debug_prompt: bool = False
+txt_io_buffer_size: int = 16 * 1024 * 1024  # Read/write buffer of large text file operations
+trash_dir_prefix: str = '.trash-'  # Sibling folders create_n_wipe_dir(background=True) purges in the background
+_trash_purge_dict: Dict[Path, threading.Thread] = {}
+_trash_purge_lock = threading.Lock()
+classify_scan_min_count: int = 8  # classify_many lists a parent directory once it holds this many of the paths
+IO_REPARSE_TAG_MOUNT_POINT = 0xA0000003  # Windows junction / volume mount point reparse tag
+_numpy = None  # numpy module once looked up (False if not installed), see _get_numpy
+magic_sniff_size: int = 64  # Bytes read per file to recognize its type (see register_file_type)
+scan_read_ahead: int = 4  # Parallel scans list at most workers * this many directories ahead of their consumer
 
 
 class File:
-    def __init__(self, path: Path):
+    """
+    File on disk. Name, extension and size are only computed on first access (then cached), so building many
+    File objects is cheap. A scanner can hand over the os.stat_result or os.DirEntry it already has to avoid
+    another stat() syscall. Call refresh() when the file changed on disk.
+    """
+    __slots__ = ('path', '_stat_info', '_file_name', '_name_without_ext', '_ext', '_size')
+
+    def __init__(self, path: Path, stat_info: Union[os.stat_result, os.DirEntry, None] = None):
         self.path = path
-        self.file_name = self.__get_file_name()
-        self.name_without_ext = self.__get_name_without_ext()
-        self.ext: Union[str, None] = self.__get_ext()
-        self.size: Union[int, None] = self.__get_size()
+        self._stat_info = stat_info
+
+    @property
+    def file_name(self) -> str:
+        try:
+            return self._file_name
+        except AttributeError:
+            self._file_name = self.__get_file_name()
+            return self._file_name
+
+    @property
+    def name_without_ext(self) -> str:
+        try:
+            return self._name_without_ext
+        except AttributeError:
+            self._name_without_ext = self.__get_name_without_ext()
+            return self._name_without_ext
+
+    @property
+    def ext(self) -> Union[str, None]:
+        try:
+            return self._ext
+        except AttributeError:
+            self._ext = self.__get_ext()
+            return self._ext
+
+    @property
+    def size(self) -> Union[int, None]:
+        try:
+            return self._size
+        except AttributeError:
+            self._size = self.__get_size()
+            return self._size
+
+    def stat(self) -> Optional[os.stat_result]:
+        """
+        Return the (cached) stat result of the file, or None if file does not exist.
+        Re-uses the stat info given at creation when available.
+        """
+        stat_info = self._stat_info
+        if isinstance(stat_info, os.stat_result):
+            return stat_info
+        try:
+            if isinstance(stat_info, os.DirEntry):
+                stat_result = stat_info.stat()  # DirEntry caches it (free on Windows)
+            else:
+                stat_result = self.path.stat()
+        except FileNotFoundError:
+            return None
+        self._stat_info = stat_result
+        return stat_result
+
+    def refresh(self):
+        """
+        Forget everything cached about the file (stat info, size...), it will be read again on next access.
+        """
+        self._stat_info = None
+        for slot in ('_file_name', '_name_without_ext', '_ext', '_size'):
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                pass
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickles the set slots; an os.DirEntry (not picklable) is replaced by its stat result, or None if unavailable.
+        """
+        state = {slot: getattr(self, slot) for cls in type(self).__mro__ for slot in getattr(cls, '__slots__', ())
+                 if hasattr(self, slot)}
+        if isinstance(self._stat_info, os.DirEntry):
+            try:
+                state['_stat_info'] = self._stat_info.stat()
+            except OSError:
+                state['_stat_info'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
     def __get_file_name(self) -> str:
         return self.path.name
@@ -58,10 +166,40 @@ class File:
 
     def __get_size(self) -> Union[int, None]:
         """Return the file size in bytes, or None if file does not exist."""
+        stat_result = self.stat()
+        if stat_result is None:
+            return None
+        return stat_result.st_size
+
+    def hash(self, algo: str = 'sha256', use_cache: bool = True) -> Optional[str]:
+        """
+        Returns the hex digest of the file contents (None if file does not exist).
+        Streams the file in large chunks; with use_cache, the digest is kept in fileUtils.hash_cache under
+        (device, inode, size, mtime), so an unchanged file is never read twice.
+        """
+        stat_result = self.stat()
+        if stat_result is None:
+            return None
+        if stat_result.st_ino == 0:  # DirEntry stat on Windows has no inode: get the real one
+            try:
+                stat_result = os.stat(self.path)
+            except FileNotFoundError:
+                return None
+
+        key = HashCache.get_key(stat_result, algo)
+        if use_cache and key is not None:
+            digest = hash_cache.get(key)
+            if digest is not None:
+                return digest
+
         try:
-            return self.path.stat().st_size
+            digest = _hash_file_contents(self.path, algo)
+            # Only cache if the file did not change while being read
+            if use_cache and key is not None and HashCache.get_key(os.stat(self.path), algo) == key:
+                hash_cache.set(key, digest)
         except FileNotFoundError:
             return None
+        return digest
 
     def delete_file(self) -> bool:
         """
@@ -72,6 +210,7 @@ class File:
             log(Severity.WARNING, 'Delete File', f'Deleting "{self.path}", proceed?', popup=True)
         try:
             os.remove(self.path)
+            self.refresh()
             return not self.path.exists()
         except Exception:
             return False
@@ -117,9 +256,23 @@ class File:
 
 
 class TXTFile(File):
-    def __init__(self, path: Path):
-        super().__init__(path)
+    __slots__ = ('line_lst', '_mmap', '_line_offsets')
+
+    def __init__(self, path: Path, stat_info: Union[os.stat_result, os.DirEntry, None] = None):
+        super().__init__(path, stat_info)
         self.line_lst = []
+        self._mmap: Optional[mmap.mmap] = None
+        self._line_offsets: Optional[array] = None
+
+    def refresh(self):
+        self.close_mmap()
+        super().refresh()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state['_mmap'] = None  # The map and its line index are rebuilt on demand
+        state['_line_offsets'] = None
+        return state
 
     def read_lines(self) -> List[str]:
         """
@@ -129,35 +282,236 @@ class TXTFile(File):
             self.line_lst = f.read().splitlines()
         return self.line_lst
 
-    def write_lines(self, path: Union[Path, None] = None):
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Yields the lines of the text file one at a time (without line endings), through a large read buffer.
+        Memory stays constant whatever the file size. Lines are split on \\n, \\r\\n and \\r.
+        """
+        with open(self.path, "r", encoding="utf-8-sig", buffering=txt_io_buffer_size) as f:
+            for line in f:
+                yield line[:-1] if line.endswith('\n') else line
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # MEMORY-MAPPED ACCESS
+    # The file is mapped on first use and an index of line start offsets is built once (8 bytes per line);
+    # lines are then decoded on demand. Lines are split on \n (a trailing \r is dropped).
+    # Call close_mmap() (or refresh()) when done, or once the file changed on disk.
+
+    def line_count(self) -> int:
+        """
+        Returns the number of lines of the file (a trailing line ending does not start a new line).
+        """
+        return len(self.__get_line_offsets()) - 1
+
+    def line(self, idx: int) -> str:
+        """
+        Returns line number idx (0 based, negative counts from the end) without reading the rest of the file.
+        """
+        line_offsets = self.__get_line_offsets()
+        count = len(line_offsets) - 1
+        if idx < 0:
+            idx += count
+        if not 0 <= idx < count:
+            raise IndexError(f'Line {idx} out of range ({count} lines in "{self.path}")')
+        return self.__decode_line(line_offsets[idx], line_offsets[idx + 1])
+
+    def get_lines(self, start: int, stop: Optional[int] = None) -> List[str]:
+        """
+        Returns lines [start:stop] (same rules as list slicing), decoding only those.
+        """
+        line_offsets = self.__get_line_offsets()
+        start, stop, _ = slice(start, stop).indices(len(line_offsets) - 1)
+        return [self.__decode_line(line_offsets[i], line_offsets[i + 1]) for i in range(start, stop)]
+
+    def close_mmap(self):
+        """
+        Unmaps the file and forgets the line index.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._line_offsets = None
+
+    def __decode_line(self, start: int, end: int) -> str:
+        data = self._mmap[start:end]
+        if data.endswith(b'\n'):
+            data = data[:-1]
+        if data.endswith(b'\r'):
+            data = data[:-1]
+        return data.decode('utf-8')
+
+    def __get_line_offsets(self) -> array:
+        """
+        Returns the start offset of every line, plus the end of the file as last item (built once).
+        """
+        if self._line_offsets is not None:
+            return self._line_offsets
+
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        mapped = self._mmap
+        start = len(codecs.BOM_UTF8) if mapped is not None and mapped[:3] == codecs.BOM_UTF8 else 0
+        line_offsets = array('Q', [start])
+        # Split chunk by chunk: offsets of the line starts are the running sum of (part length + 1)
+        chunk_start = start
+        while chunk_start < size:
+            part_lst = mapped[chunk_start:chunk_start + txt_io_buffer_size].split(b'\n')
+            line_offsets.extend(islice(accumulate(map(add, map(len, part_lst[:-1]), repeat(1)),
+                                                  initial=chunk_start), 1, None))
+            chunk_start += txt_io_buffer_size
+
+        if line_offsets[-1] != size:
+            line_offsets.append(size)  # Last line has no line ending
+        self._line_offsets = line_offsets
+        return line_offsets
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # IN-PLACE EDITS
+    # These edit the file on disk directly (self.line_lst is left untouched) and only write the bytes that change:
+    # appends seek to the end, same-size replacements are overwritten in place, other edits only shift what follows
+    # the edited lines. New lines use the line ending already used in the file.
+
+    def append_lines(self, line_lst: List[str]):
+        """
+        Appends lines at the end of the file (creating it if missing), without reading or rewriting it.
+        """
+        self.__check_lines(line_lst, 'TXTFile.append_lines')
+        if not line_lst:
+            return
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.close_mmap()
+        self.make_writable()
+
+        with open(self.path, 'a+b') as f:  # Writes always go to the end
+            size = f.seek(0, os.SEEK_END)
+            f.seek(0)
+            head = f.read(64 * 1024)
+            line_ending = _detect_line_ending(head)
+            data = line_ending.join(line.encode('utf-8') for line in line_lst)
+
+            if size > (len(codecs.BOM_UTF8) if head.startswith(codecs.BOM_UTF8) else 0):
+                f.seek(size - 1)
+                if f.read(1) == b'\n':
+                    data += line_ending  # Keep the file ending with a line ending
+                else:
+                    data = line_ending + data  # Terminate the current last line first
+            f.write(data)
+        self.refresh()
+
+    def replace_line_range(self, start: int, stop: int, line_lst: List[str]):
+        """
+        Replaces lines [start:stop] of the file by line_lst (which can have another length, or be empty to delete).
+        start == stop inserts before line start; start == stop == line_count() appends.
+        """
+        self.__check_lines(line_lst, 'TXTFile.replace_line_range')
+        line_offsets = self.__get_line_offsets()
+        count = len(line_offsets) - 1
+        start, stop, _ = slice(start, stop).indices(count)
+        stop = max(start, stop)
+
+        mapped = self._mmap
+        size = line_offsets[-1]
+        line_ending = _detect_line_ending(mapped[:64 * 1024] if mapped is not None else b'')
+        ends_with_line_ending = count > 0 and mapped[size - 1:size] == b'\n'
+
+        byte_start = line_offsets[start]
+        byte_end = line_offsets[stop]
+        data = line_ending.join(line.encode('utf-8') for line in line_lst)
+
+        if stop < count or ends_with_line_ending:
+            if line_lst:
+                data += line_ending
+        elif count > 0:
+            # Editing the last line of the file, which has no line ending
+            if line_lst and start == count:
+                data = line_ending + data  # Appending: terminate the current last line first
+            elif not line_lst and 0 < start < stop:
+                # Deleting up to the end: the new last line loses its line ending
+                byte_start -= 2 if mapped[byte_start - 2:byte_start] == b'\r\n' else 1
+
+        if data == (mapped[byte_start:byte_end] if mapped is not None else b''):
+            return  # Nothing changes
+
+        self.close_mmap()
+        self.make_writable()
+        self.__write_byte_range(byte_start, byte_end, data, size)
+        self.refresh()
+
+    def truncate_tail(self, line_count: int):
+        """
+        Cuts the file after its first line_count lines (only the end of the file is touched).
+        """
+        self.replace_line_range(line_count, self.line_count(), [])
+
+    def __write_byte_range(self, start: int, end: int, data: bytes, size: int):
+        """
+        Replaces bytes [start:end] of the file by data, shifting the bytes after end (in chunks) when needed.
+        """
+        delta = len(data) - (end - start)
+        chunk_size = txt_io_buffer_size
+        with open(self.path, 'r+b') as f:
+            if delta < 0:
+                # Shrinking: move the tail towards the start, front to back
+                for src in range(end, size, chunk_size):
+                    f.seek(src)
+                    chunk = f.read(chunk_size)
+                    f.seek(src + delta)
+                    f.write(chunk)
+                f.truncate(size + delta)
+            elif delta > 0:
+                # Growing: move the tail towards the end, back to front
+                src_end = size
+                while src_end > end:
+                    src = max(end, src_end - chunk_size)
+                    f.seek(src)
+                    chunk = f.read(src_end - src)
+                    f.seek(src + delta)
+                    f.write(chunk)
+                    src_end = src
+            f.seek(start)
+            f.write(data)
+
+    @staticmethod
+    def __check_lines(line_lst: List[str], tool_name: str):
+        for i, line in enumerate(line_lst):
+            if '\n' in line or '\r' in line:
+                log(Severity.CRITICAL, tool_name, f'Line ending found in line {i}: {repr(line)}.')
+
+    def write_lines(self, path: Union[Path, None] = None, fsync: bool = False):
         """
         Export self.line_lst to the given path if provided (else use the current file path)
+        The file is written next to the target and swapped in place, so a crash never leaves it half-written.
+        :param fsync: Flush to disk before swapping (slower, survives power loss)
         """
-        # Ensures there is no \n in lines (exporter already takes care of that). Critical error if that's the case.
-        for i, line in enumerate(self.line_lst):
-            if "\n" in line:
-                log(Severity.CRITICAL,
-                    "TXTFile.export",
-                    f"Slash N found in export on line {i}: {repr(line)}. "
-                    "Please resolve upstream (exporter adds newlines automatically).")
+        # Serialize in one go; if there are more \n than separators, a line has one (exporter already takes care
+        # of that). Critical error if that's the case.
+        text = "\n".join(self.line_lst)
+        if self.line_lst and text.count("\n") != len(self.line_lst) - 1:
+            i, line = next((i, line) for i, line in enumerate(self.line_lst) if "\n" in line)
+            log(Severity.CRITICAL,
+                "TXTFile.export",
+                f"Slash N found in export on line {i}: {repr(line)}. "
+                "Please resolve upstream (exporter adds newlines automatically).")
 
         # Get export path
-        export_path = path or self.path
+        export_path = Path(path or self.path)
 
         # Make export dir (if missing)
         export_dir = export_path.parent
         export_dir.mkdir(parents=True, exist_ok=True)
 
-        # Ensure file writable if exists
-        self.make_writable()
+        # Ensure file writable if exists (and not mapped, which would lock it on Windows)
+        self.close_mmap()
+        File(export_path).make_writable()
 
         # Write file
-        with open(export_path, "w", encoding="utf-8") as f:
-            for i, line in enumerate(self.line_lst):
-                if i < len(self.line_lst) - 1:
-                    f.write(f"{line}\n")
-                else:
-                    f.write(line)
+        with atomic_open(export_path, "w", encoding="utf-8", fsync=fsync) as f:
+            f.write(text)
+        if export_path == self.path:
+            self.refresh()
 
     def edit_in_default_editor(self):
         path_str = str(self.path)
@@ -174,6 +528,24 @@ class TXTFile(File):
                 subprocess.run(["xdg-open", path_str])
 
 
+# File subclass registry (see register_file_type)
+_file_type_ext_dict: Dict[str, Type[File]] = {'txt': TXTFile}
+_file_type_magic_dict: Dict[Tuple[int, int], Dict[bytes, Type[File]]] = {}  # {(offset, length): {magic: class}}
+_file_type_magic_key_lst: List[Tuple[int, int]] = []
+_file_types_loaded = False
+_file_types_lock = threading.Lock()
+
+
+def _detect_line_ending(head: bytes) -> bytes:
+    """
+    Returns the line ending used at the start of a file (from its first bytes), else the OS one.
+    """
+    idx = head.find(b'\n')
+    if idx < 0:
+        return os.linesep.encode()
+    return b'\r\n' if head[idx - 1:idx] == b'\r' else b'\n'
+
+
 def get_file_path_list(dir_name: Union[str, Path], recursive=True, filter_extension=None) -> List[str]:
     """
     Returns list of all files under a specific directory. Properly sorted
@@ -219,7 +591,7 @@ def get_file_path_list(dir_name: Union[str, Path], recursive=True, filter_extens
         # If entry is a directory then get the list of files in this directory
         if os.path.isdir(full_path):
             if recursive:
-                all_files = all_files + get_file_path_list(full_path)
+                all_files = all_files + get_file_path_list(full_path, filter_extension=filter_extension)
         else:
             all_files.append(full_path)
 
@@ -234,37 +606,852 @@ def get_file_path_list(dir_name: Union[str, Path], recursive=True, filter_extens
     return all_files
 
 
-def get_file_list_from_path(dir_name: Union[str, Path], recursive=True, filter_extension=None) -> List[File]:
+def get_file_list_from_path(dir_name: Union[str, Path], recursive=True, filter_extension=None,
+                            parallel: int = 0, scan_filter: Optional['ScanFilter'] = None,
+                            sniff: bool = False) -> List[File]:
     """
     Returns a list of File objects under a specific directory.
-    Uses the appropriate File subclass based on the file extension.
-    Keeps the same ordering/behavior as deprecated get_file_path_list.
+    Uses the appropriate File subclass based on the file extension (or contents, with sniff; see iter_files).
+    Ordering is the one documented on get_file_path_list (root files first, then sorted sub-folders).
+    See iter_files to process files as they are found instead of waiting for the whole list.
     """
-    base_path = Path(dir_name)
-    list_of_entries = sorted(os.listdir(base_path))
-    all_files: List[File] = []
+    return list(iter_files(dir_name, recursive=recursive, filter_extension=filter_extension, parallel=parallel,
+                           scan_filter=scan_filter, sniff=sniff))
 
-    for entry in list_of_entries:
-        full_path = base_path / entry
 
-        if full_path.is_dir():
-            if recursive:
-                all_files += get_file_list_from_path(
-                    full_path,
-                    recursive=recursive,
-                    filter_extension=filter_extension,
-                )
-        elif full_path.suffix.lower() == '.txt':
-            all_files.append(TXTFile(full_path))
-        else:
-            all_files.append(File(full_path))
+def iter_files(dir_name: Union[str, Path], recursive=True, filter_extension=None,
+               parallel: int = 0, scan_filter: Optional['ScanFilter'] = None, sniff: bool = False) -> Iterator[File]:
+    """
+    Yields File objects under a specific directory, as they are found.
 
-    # Apply file extension filter
-    if filter_extension is not None:
-        ext = filter_extension.lower().lstrip('.')
-        return [file for file in all_files if file.ext == ext]
+    Walks with os.scandir over an explicit stack (no recursion, no intermediate lists) so the type of every entry
+    comes from the directory listing itself, and the DirEntry is handed to the File (stat only when size is needed).
+    Order: files of a directory first (sorted), then each sub-folder (sorted), depth first.
 
-    return all_files
+    :param dir_name: Directory in which to look under
+    :param recursive: Indicate if sub-directories should be included, recursively
+    :param filter_extension: File extension to retain (e.g. 'txt'); other files never become File objects
+    :param parallel: Number of threads listing directories ahead of time (for network mounts). 0 = serial.
+    :param scan_filter: ScanFilter checked during the walk (skipped files / pruned folders are never processed)
+    :param sniff: Pick the File subclass from the first bytes of each file (magic number) before the extension,
+    read for a whole directory at once (see sniff_file_heads)
+    """
+    ext_filter = filter_extension.lower().lstrip('.') if filter_extension is not None else None
+    # One pool for the sniffing reads of the whole scan
+    sniff_executor = ThreadPoolExecutor(max_workers=parallel, thread_name_prefix='fileUtils.sniff') \
+        if sniff and parallel > 1 else None
+
+    try:
+        for current_dir, file_entry_lst in iter_dir_listings(dir_name, recursive=recursive, parallel=parallel,
+                                                             scan_filter=scan_filter):
+            if ext_filter is not None:
+                file_entry_lst = [entry for entry in file_entry_lst if get_name_ext(entry.name) == ext_filter]
+            if sniff:
+                head_lst = sniff_file_heads([entry.path for entry in file_entry_lst], executor=sniff_executor)
+            else:
+                head_lst = repeat(None)
+
+            for entry, head in zip(file_entry_lst, head_lst):
+                yield get_file_class(entry.name, head)(current_dir / entry.name, entry)
+    finally:
+        if sniff_executor is not None:
+            sniff_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_name_ext(file_name: str) -> str:
+    """
+    Returns the extension of a file name, lower case and without the dot ('' when there is none).
+    """
+    return os.path.splitext(file_name)[1].lstrip('.').lower()
+
+
+def register_file_type(file_class: Type[File], extensions: Iterable[str] = (), magic: Iterable[bytes] = (),
+                       offset: int = 0):
+    """
+    Registers the File subclass get_file_class picks for files with one of the extensions or, when the start of the
+    file is known (sniffing), for files holding one of the magic byte strings at offset (whatever their extension).
+    Modules defining File subclasses register them when imported.
+    """
+    for ext in extensions:
+        _file_type_ext_dict[ext.lower().lstrip('.')] = file_class
+    for magic_bytes in magic:
+        if offset + len(magic_bytes) > magic_sniff_size:
+            log(Severity.CRITICAL, 'fileUtils.register_file_type',
+                f'Magic of {file_class.__name__} ends past the {magic_sniff_size} sniffed bytes')
+        _file_type_magic_dict.setdefault((offset, len(magic_bytes)), {})[bytes(magic_bytes)] = file_class
+    # Longest magic numbers checked first (most specific)
+    _file_type_magic_key_lst[:] = sorted(_file_type_magic_dict, key=lambda key: key[1], reverse=True)
+
+
+def get_file_class(file_name: str, head: Optional[bytes] = None) -> Type[File]:
+    """
+    Returns the File subclass to use for a file: from the start of its contents when given (see sniff_file_heads)
+    and it holds a registered magic number, else from its extension.
+    """
+    if not _file_types_loaded:
+        _load_file_types()
+    if head:
+        for offset, length in _file_type_magic_key_lst:
+            file_class = _file_type_magic_dict[(offset, length)].get(head[offset:offset + length])
+            if file_class is not None:
+                return file_class
+    return _file_type_ext_dict.get(get_name_ext(file_name), File)
+
+
+def get_file_class_from_path(path: Union[str, Path]) -> Type[File]:
+    """
+    Returns the File subclass to use for a file on disk (reads its first magic_sniff_size bytes).
+    """
+    return get_file_class(os.path.basename(path), sniff_file_heads([path])[0])
+
+
+def sniff_file_heads(path_lst: Iterable[Union[str, Path]], size: Optional[int] = None, workers: int = 0,
+                     executor: Optional[ThreadPoolExecutor] = None) -> List[Optional[bytes]]:
+    """
+    Reads the first bytes (magic_sniff_size by default) of many files, one small read each (None when unreadable).
+    :param workers: When > 1, reads are spread across a thread pool (network shares)
+    :param executor: Existing thread pool to spread the reads across (instead of one created for this call)
+    """
+    size = magic_sniff_size if size is None else size
+
+    def read_head(path) -> Optional[bytes]:
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        except OSError:
+            return None
+        try:
+            return os.read(fd, size)
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+
+    if executor is not None:
+        return list(executor.map(read_head, path_lst))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fileUtils.sniff') as executor:
+            return list(executor.map(read_head, path_lst))
+    return [read_head(path) for path in path_lst]
+
+
+def _load_file_types():
+    """
+    Imports the modules defining File subclasses (once) so they register; those whose dependencies are missing are
+    skipped. Other threads wait until every module registered (scans may classify files from worker threads).
+    """
+    global _file_types_loaded
+    with _file_types_lock:
+        if _file_types_loaded:
+            return
+        for module_name in ('xmlUtils', 'zipUtils', 'dmgUtils', 'appImageUtils'):
+            try:
+                importlib.import_module(f'.{module_name}', __package__)
+            except ImportError:
+                pass  # Optional dependency missing: its files stay plain File objects
+        _file_types_loaded = True
+
+
+def iter_dir_listings(dir_name: Union[str, Path], recursive=True, parallel: int = 0,
+                      scan_filter: Optional['ScanFilter'] = None) -> Iterator[Tuple[Path, List[os.DirEntry]]]:
+    """
+    Yields (directory, sorted file entries) for every directory of a tree, in iter_files order.
+
+    With parallel > 1, directories are listed ahead of time by a bounded thread pool (every listed directory
+    queues its sub-folders right away), which hides the round-trip latency of NFS/SMB mounts. Output order is
+    still the serial one; only the listing work is spread.
+    With a scan_filter, only matching file entries are returned and pruned folders are never listed.
+    """
+    root = Path(dir_name)
+    if parallel > 1:
+        yield from _iter_dir_listings_parallel(root, recursive, parallel, scan_filter)
+        return
+
+    # Stack of directories left to list; sub-folders pushed in reverse so they pop in sorted order
+    dir_stack: List[Path] = [root]
+    while dir_stack:
+        current_dir = dir_stack.pop()
+        file_entry_lst, sub_dir_lst = _list_dir(current_dir, recursive, scan_filter, root)
+        yield current_dir, file_entry_lst
+        dir_stack.extend(reversed(sub_dir_lst))
+
+
+def _iter_dir_listings_parallel(root: Path, recursive: bool, workers: int,
+                                scan_filter: Optional['ScanFilter']) -> Iterator[Tuple[Path, List[os.DirEntry]]]:
+    # Listings are submitted by the consumer only, for the next directories it will reach (top of its stack), at
+    # most read_ahead at a time: memory stays bounded whatever the size of the tree and the speed of the consumer
+    future_dict: Dict[Path, Future] = {}
+    read_ahead = workers * scan_read_ahead
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fileUtils.scan')
+
+    def list_task(dir_path: Path):
+        return _list_dir(dir_path, recursive, scan_filter, root)
+
+    try:
+        dir_stack: List[Path] = [root]
+        while dir_stack:
+            # Top of the stack first: a slot is always free for it (one listing was consumed since the last fill)
+            for dir_path in reversed(dir_stack[-read_ahead:]):
+                if len(future_dict) >= read_ahead:
+                    break
+                if dir_path not in future_dict:
+                    future_dict[dir_path] = executor.submit(list_task, dir_path)
+            current_dir = dir_stack.pop()
+            file_entry_lst, sub_dir_lst = future_dict.pop(current_dir).result()
+            dir_stack.extend(reversed(sub_dir_lst))
+            yield current_dir, file_entry_lst
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _list_dir(dir_path: Path, recursive: bool, scan_filter: Optional['ScanFilter'] = None,
+              root: Optional[Path] = None) -> Tuple[List[os.DirEntry], List[Path]]:
+    """
+    Lists a directory once: returns its file entries and its sub-folder paths (if recursive), both sorted by name.
+    """
+    with os.scandir(dir_path) as it:
+        entry_lst = sorted(it, key=lambda e: e.name)
+
+    # Relative path prefix of the entries, only built when path patterns need it
+    rel_prefix = ''
+    if scan_filter is not None and scan_filter.uses_rel_path and dir_path != root:
+        rel_prefix = dir_path.relative_to(root).as_posix() + '/'
+
+    file_entry_lst: List[os.DirEntry] = []
+    sub_dir_lst: List[Path] = []
+    for entry in entry_lst:
+        if entry.is_dir():
+            if recursive and (scan_filter is None or not scan_filter.is_pruned(entry.name, rel_prefix + entry.name)):
+                sub_dir_lst.append(dir_path / entry.name)
+        elif scan_filter is None or scan_filter.is_match(entry, rel_prefix + entry.name):
+            file_entry_lst.append(entry)
+    return file_entry_lst, sub_dir_lst
+
+
+class ScanFilter:
+    """
+    File selection for the tree scanner, compiled once and checked during the walk.
+
+    Glob patterns without a '/' are matched against the entry name, the others against the path relative to the
+    scanned root ('/' separated, '*' also crosses '/' as with fnmatch). Name checks run first; size / mtime
+    checks (which need a stat) only run on files that passed them.
+
+    :param include: Globs a file must match (any of them) to be kept
+    :param exclude: Globs of files to skip
+    :param extensions: Extensions to keep (e.g. ['jpg', '.PNG'])
+    :param min_size: Minimum file size in bytes
+    :param max_size: Maximum file size in bytes
+    :param min_mtime: Keep files modified at or after this timestamp (seconds since epoch)
+    :param max_mtime: Keep files modified at or before this timestamp (seconds since epoch)
+    :param prune: Globs of folders not to descend into (e.g. ['.git', '__pycache__', 'node_modules'])
+    """
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = (), extensions: Iterable[str] = (),
+                 min_size: Optional[int] = None, max_size: Optional[int] = None,
+                 min_mtime: Optional[float] = None, max_mtime: Optional[float] = None, prune: Iterable[str] = ()):
+        self.extension_set = frozenset(ext.lower().lstrip('.') for ext in extensions)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.min_mtime = min_mtime
+        self.max_mtime = max_mtime
+
+        include = list(include)
+        exclude = list(exclude)
+        prune = list(prune)
+        self.has_include = bool(include)
+        self.__include_name = self.__compile([p for p in include if '/' not in p])
+        self.__include_path = self.__compile([p for p in include if '/' in p])
+        self.__exclude_name = self.__compile([p for p in exclude if '/' not in p])
+        self.__exclude_path = self.__compile([p for p in exclude if '/' in p])
+        self.__prune_name = self.__compile([p for p in prune if '/' not in p])
+        self.__prune_path = self.__compile([p for p in prune if '/' in p])
+        self.uses_rel_path = any(pattern is not None for pattern in (self.__include_path, self.__exclude_path,
+                                                                      self.__prune_path))
+        self.__needs_stat = any(value is not None for value in (min_size, max_size, min_mtime, max_mtime))
+
+    @staticmethod
+    def __compile(pattern_lst: List[str]) -> Optional[Pattern]:
+        """
+        Compiles a list of globs into a single regex (None if the list is empty).
+        """
+        if not pattern_lst:
+            return None
+        flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0  # Case-insensitive file systems (Windows)
+        return re.compile('|'.join(fnmatch.translate(pattern) for pattern in pattern_lst), flags)
+
+    def is_pruned(self, dir_name: str, rel_path: str) -> bool:
+        """
+        Whether a folder (and everything below it) must be skipped.
+        """
+        if self.__prune_name is not None and self.__prune_name.match(dir_name):
+            return True
+        return self.__prune_path is not None and self.__prune_path.match(rel_path) is not None
+
+    def is_match(self, entry: os.DirEntry, rel_path: str) -> bool:
+        """
+        Whether a file entry is kept.
+        """
+        name = entry.name
+        if self.extension_set and get_name_ext(name) not in self.extension_set:
+            return False
+        if self.has_include:
+            if not ((self.__include_name is not None and self.__include_name.match(name)) or
+                    (self.__include_path is not None and self.__include_path.match(rel_path))):
+                return False
+        if self.__exclude_name is not None and self.__exclude_name.match(name):
+            return False
+        if self.__exclude_path is not None and self.__exclude_path.match(rel_path):
+            return False
+
+        if not self.__needs_stat:
+            return True
+        try:
+            entry_stat = entry.stat()
+        except FileNotFoundError:  # Broken link
+            return False
+        if self.min_size is not None and entry_stat.st_size < self.min_size:
+            return False
+        if self.max_size is not None and entry_stat.st_size > self.max_size:
+            return False
+        if self.min_mtime is not None and entry_stat.st_mtime < self.min_mtime:
+            return False
+        if self.max_mtime is not None and entry_stat.st_mtime > self.max_mtime:
+            return False
+        return True
+
+
+class FileTable:
+    """
+    Columnar scan result (see get_file_table_from_path): one row per file, with name, size, mtime and mode kept in
+    arrays instead of one File object per file. Directory paths and extensions are interned (stored once, rows keep
+    their index). Rows only become File objects when asked for (file, iter_files).
+    filter / sort / group_by_extension / extension_totals work on the columns, vectorized when NumPy is installed.
+    """
+    __slots__ = ('dir_lst', 'ext_lst', 'name_lst', 'dir_idx', 'ext_idx', 'size', 'mtime_ns', 'mode',
+                 '_dir_index_dict', '_ext_index_dict')
+
+    def __init__(self):
+        self.dir_lst: List[str] = []
+        self.ext_lst: List[str] = []
+        self._dir_index_dict: Dict[str, int] = {}
+        self._ext_index_dict: Dict[str, int] = {}
+        self.name_lst: List[str] = []
+        self.dir_idx = array('I')
+        self.ext_idx = array('I')
+        self.size = array('q')
+        self.mtime_ns = array('q')
+        self.mode = array('I')
+
+    def __len__(self):
+        return len(self.name_lst)
+
+    def __repr__(self):
+        return f'FileTable({len(self)} files in {len(set(self.dir_idx))} folders)'
+
+    def append(self, dir_path: Union[str, Path], name: str, stat_info: os.stat_result):
+        self.append_listing(dir_path, [(name, stat_info)])
+
+    def append_listing(self, dir_path: Union[str, Path],
+                       entry_lst: Iterable[Union[os.DirEntry, Tuple[str, os.stat_result]]]):
+        """
+        Adds the files of one directory (DirEntry objects, or (name, stat) pairs). Broken links are skipped.
+        """
+        dir_path = str(dir_path)
+        dir_i = self._dir_index_dict.get(dir_path)
+        if dir_i is None:
+            dir_i = self._dir_index_dict[dir_path] = len(self.dir_lst)
+            self.dir_lst.append(dir_path)
+        ext_index_dict = self._ext_index_dict
+        for entry in entry_lst:
+            if isinstance(entry, tuple):
+                name, stat_info = entry
+            else:
+                name = entry.name
+                try:
+                    stat_info = entry.stat()
+                except OSError:  # Broken link, vanished
+                    continue
+            ext = get_name_ext(name)
+            ext_i = ext_index_dict.get(ext)
+            if ext_i is None:
+                ext_i = ext_index_dict[ext] = len(self.ext_lst)
+                self.ext_lst.append(ext)
+            self.name_lst.append(name)
+            self.dir_idx.append(dir_i)
+            self.ext_idx.append(ext_i)
+            self.size.append(stat_info.st_size)
+            self.mtime_ns.append(stat_info.st_mtime_ns)
+            self.mode.append(stat_info.st_mode)
+
+    # ROWS
+
+    def path(self, row: int) -> Path:
+        return Path(self.dir_lst[self.dir_idx[row]], self.name_lst[row])
+
+    def ext(self, row: int) -> str:
+        return self.ext_lst[self.ext_idx[row]]
+
+    def file(self, row: int) -> File:
+        return get_file_class(self.name_lst[row])(self.path(row))
+
+    def iter_files(self) -> Iterator[File]:
+        for row in range(len(self)):
+            yield self.file(row)
+
+    def to_file_list(self) -> List[File]:
+        return list(self.iter_files())
+
+    def total_size(self) -> int:
+        numpy = _get_numpy()
+        if numpy is not None and len(self):
+            return int(_column_view(numpy, self.size).sum())
+        return sum(self.size)
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """
+        NumPy views (no copy) of the numeric columns. Requires NumPy.
+        """
+        import numpy
+        return {name: _column_view(numpy, getattr(self, name))
+                for name in ('dir_idx', 'ext_idx', 'size', 'mtime_ns', 'mode')}
+
+    # SELECTION
+
+    def take(self, row_lst: Iterable[int]) -> 'FileTable':
+        """
+        Returns a table of the given rows, in that order (sharing this table's interned folders / extensions).
+        """
+        table = FileTable.__new__(FileTable)
+        table.dir_lst = self.dir_lst
+        table.ext_lst = self.ext_lst
+        table._dir_index_dict = self._dir_index_dict
+        table._ext_index_dict = self._ext_index_dict
+        numpy = _get_numpy()
+        if numpy is not None and len(self):
+            row_array = numpy.asarray(row_lst, dtype=numpy.intp)
+            for name in ('dir_idx', 'ext_idx', 'size', 'mtime_ns', 'mode'):
+                column = getattr(self, name)
+                setattr(table, name, array(column.typecode, _column_view(numpy, column)[row_array].tobytes()))
+            table.name_lst = [self.name_lst[row] for row in row_array.tolist()]
+            return table
+        row_lst = list(row_lst)
+        for name in ('dir_idx', 'ext_idx', 'size', 'mtime_ns', 'mode'):
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, [column[row] for row in row_lst]))
+        table.name_lst = [self.name_lst[row] for row in row_lst]
+        return table
+
+    def filter(self, min_size: Optional[int] = None, max_size: Optional[int] = None,
+               extensions: Iterable[str] = (), min_mtime: Optional[float] = None,
+               max_mtime: Optional[float] = None) -> 'FileTable':
+        """
+        Returns the rows matching every given criterion (same meaning as in ScanFilter).
+        """
+        ext_i_set = {self._ext_index_dict[ext] for ext in (e.lower().lstrip('.') for e in extensions)
+                     if ext in self._ext_index_dict}
+        if extensions and not ext_i_set:
+            return self.take([])
+        min_mtime_ns = None if min_mtime is None else int(min_mtime * 1_000_000_000)
+        max_mtime_ns = None if max_mtime is None else int(max_mtime * 1_000_000_000)
+
+        numpy = _get_numpy()
+        if numpy is not None and len(self):
+            mask = numpy.ones(len(self), dtype=bool)
+            size = _column_view(numpy, self.size)
+            mtime_ns = _column_view(numpy, self.mtime_ns)
+            if min_size is not None:
+                mask &= size >= min_size
+            if max_size is not None:
+                mask &= size <= max_size
+            if min_mtime_ns is not None:
+                mask &= mtime_ns >= min_mtime_ns
+            if max_mtime_ns is not None:
+                mask &= mtime_ns <= max_mtime_ns
+            if ext_i_set:
+                mask &= numpy.isin(_column_view(numpy, self.ext_idx), list(ext_i_set))
+            return self.take(numpy.flatnonzero(mask))
+
+        size, mtime_ns, ext_idx = self.size, self.mtime_ns, self.ext_idx
+        return self.take([row for row in range(len(self)) if
+                          (min_size is None or size[row] >= min_size) and
+                          (max_size is None or size[row] <= max_size) and
+                          (min_mtime_ns is None or mtime_ns[row] >= min_mtime_ns) and
+                          (max_mtime_ns is None or mtime_ns[row] <= max_mtime_ns) and
+                          (not ext_i_set or ext_idx[row] in ext_i_set)])
+
+    def argsort(self, key: str = 'path', reverse: bool = False) -> Sequence[int]:
+        """
+        Row order sorted by 'path', 'name', 'ext', 'size' or 'mtime' (stable).
+        """
+        if key in ('size', 'mtime'):
+            column = self.size if key == 'size' else self.mtime_ns
+            numpy = _get_numpy()
+            if numpy is not None and len(self):
+                view = _column_view(numpy, column)
+                order = numpy.argsort(-view if reverse else view, kind='stable')
+                return order.tolist()
+            return sorted(range(len(self)), key=column.__getitem__, reverse=reverse)
+        if key == 'name':
+            return sorted(range(len(self)), key=self.name_lst.__getitem__, reverse=reverse)
+        if key == 'ext':
+            ext_lst, ext_idx = self.ext_lst, self.ext_idx
+            return sorted(range(len(self)), key=lambda row: ext_lst[ext_idx[row]], reverse=reverse)
+        if key == 'path':
+            # Rank folders once, rows then sort on (folder rank, name)
+            dir_rank_lst = [0] * len(self.dir_lst)
+            for rank, dir_i in enumerate(sorted(range(len(self.dir_lst)), key=self.dir_lst.__getitem__)):
+                dir_rank_lst[dir_i] = rank
+            name_lst, dir_idx = self.name_lst, self.dir_idx
+            return sorted(range(len(self)), key=lambda row: (dir_rank_lst[dir_idx[row]], name_lst[row]),
+                          reverse=reverse)
+        raise ValueError(f'Unknown sort key: {key}')
+
+    def sort(self, key: str = 'path', reverse: bool = False) -> 'FileTable':
+        return self.take(self.argsort(key, reverse))
+
+    def group_by_extension(self) -> Dict[str, 'FileTable']:
+        """
+        Returns {extension: table of its rows}.
+        """
+        numpy = _get_numpy()
+        if numpy is not None and len(self):
+            ext_idx = _column_view(numpy, self.ext_idx)
+            order = numpy.argsort(ext_idx, kind='stable')
+            ext_i_array, start_array = numpy.unique(ext_idx[order], return_index=True)
+            return {self.ext_lst[ext_i]: self.take(rows) for ext_i, rows in
+                    zip(ext_i_array.tolist(), numpy.split(order, start_array[1:]))}
+        row_dict: Dict[int, List[int]] = {}
+        for row, ext_i in enumerate(self.ext_idx):
+            row_dict.setdefault(ext_i, []).append(row)
+        return {self.ext_lst[ext_i]: self.take(row_lst) for ext_i, row_lst in sorted(row_dict.items())}
+
+    def extension_totals(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns {extension: (file count, total size)}, without building per-extension tables.
+        """
+        numpy = _get_numpy()
+        if numpy is not None and len(self):
+            ext_idx = _column_view(numpy, self.ext_idx)
+            count_array = numpy.bincount(ext_idx, minlength=len(self.ext_lst))
+            size_array = numpy.zeros(len(self.ext_lst), dtype=numpy.int64)
+            numpy.add.at(size_array, ext_idx, _column_view(numpy, self.size))
+            return {self.ext_lst[ext_i]: (int(count_array[ext_i]), int(size_array[ext_i]))
+                    for ext_i in numpy.flatnonzero(count_array).tolist()}
+        total_dict: Dict[int, List[int]] = {}
+        for ext_i, size in zip(self.ext_idx, self.size):
+            total = total_dict.setdefault(ext_i, [0, 0])
+            total[0] += 1
+            total[1] += size
+        return {self.ext_lst[ext_i]: (count, size) for ext_i, (count, size) in sorted(total_dict.items())}
+
+
+def get_file_table_from_path(dir_name: Union[str, Path], recursive=True, parallel: int = 0,
+                             scan_filter: Optional[ScanFilter] = None) -> FileTable:
+    """
+    Scans like get_file_list_from_path (same walk, order and options) but returns a FileTable: for large trees
+    (millions of files) it takes a fraction of the memory of File objects and sorts / aggregates much faster.
+    """
+    table = FileTable()
+    for current_dir, file_entry_lst in iter_dir_listings(dir_name, recursive=recursive, parallel=parallel,
+                                                         scan_filter=scan_filter):
+        table.append_listing(current_dir, file_entry_lst)
+    return table
+
+
+def _get_numpy():
+    """
+    Returns the numpy module if it is installed (optional, vectorizes FileTable operations), else None.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def _column_view(numpy, column: array):
+    return numpy.frombuffer(column, dtype=column.typecode)
+
+
+class HashCache:
+    """
+    Content digests keyed by (device, inode, size, mtime_ns, algorithm). In memory only, or also persisted in a
+    SQLite file when db_path is given (e.g. fileUtils.hash_cache = HashCache(Path(..., 'hash_cache.db'))).
+    Thread safe.
+    """
+    def __init__(self, db_path: Union[str, Path, None] = None):
+        self.db_path = Path(db_path) if db_path is not None else None
+        self.__memory_dict: Dict[tuple, str] = {}
+        self.__lock = threading.Lock()
+        self.__connection = None
+        if self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.__connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self.__connection.executescript(
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'CREATE TABLE IF NOT EXISTS hashes ('
+                '    dev INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, algo TEXT, digest TEXT NOT NULL,'
+                '    PRIMARY KEY (dev, inode, size, mtime_ns, algo)'
+                ') WITHOUT ROWID;'
+            )
+
+    @staticmethod
+    def get_key(stat_result: os.stat_result, algo: str) -> Optional[tuple]:
+        """
+        Returns the cache key of a file, or None when its file system gives no inode (can't be cached).
+        """
+        if stat_result.st_ino == 0:
+            return None
+        return stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns, algo
+
+    def get(self, key: tuple) -> Optional[str]:
+        with self.__lock:
+            digest = self.__memory_dict.get(key)
+            if digest is None and self.__connection is not None:
+                row = self.__connection.execute(
+                    'SELECT digest FROM hashes WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ? AND algo = ?',
+                    key).fetchone()
+                if row is not None:
+                    digest = self.__memory_dict[key] = row[0]
+            return digest
+
+    def set(self, key: tuple, digest: str):
+        with self.__lock:
+            self.__memory_dict[key] = digest
+            if self.__connection is not None:
+                self.__connection.execute('INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)', key + (digest,))
+                self.__connection.commit()
+
+    def close(self):
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+
+hash_cache = HashCache()
+hash_chunk_size: int = 1024 * 1024
+
+
+def hash_many(file_lst: Iterable[File], algo: str = 'sha256', workers: int = 4,
+              use_cache: bool = True) -> Dict[Path, Optional[str]]:
+    """
+    Hashes many files across a thread pool (hashlib releases the GIL on large buffers, so reads and hashing
+    overlap). Returns {path: hex digest (None if the file is gone)}, in input order.
+    """
+    file_lst = list(file_lst)
+    if workers <= 1:
+        return {file.path: file.hash(algo, use_cache=use_cache) for file in file_lst}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fileUtils.hash') as executor:
+        digest_lst = executor.map(lambda file: file.hash(algo, use_cache=use_cache), file_lst)
+        return {file.path: digest for file, digest in zip(file_lst, digest_lst)}
+
+
+def _hash_file_contents(path: Union[str, Path], algo: str) -> str:
+    hasher = hashlib.new(algo)
+    buffer = bytearray(hash_chunk_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while True:
+            read_size = f.readinto(buffer)
+            if not read_size:
+                break
+            hasher.update(view[:read_size])
+    return hasher.hexdigest()
+
+
+def find_duplicates(dir_name: Union[str, Path], min_size: int = 1, partial_size: int = 4096, algo: str = 'sha256',
+                    workers: int = 4, scan_filter: Optional[ScanFilter] = None,
+                    include_hardlinks: bool = False) -> List[List[File]]:
+    """
+    Finds files with identical contents under a directory. Returns groups of duplicate File objects (largest
+    files first, scan order within a group).
+
+    Work is staged so that only a tiny fraction of the bytes is read:
+    1. Files are grouped by size (from the scan, no read); unique sizes are dropped.
+    2. Remaining candidates are grouped by a hash of their first and last partial_size bytes.
+    3. Only files still colliding (and larger than what step 2 covered) get a full hash (File.hash, cached).
+
+    Symbolic links are skipped (they are not copies of their target).
+
+    :param min_size: Ignore files smaller than this (empty files are all identical)
+    :param include_hardlinks: Also report several paths of the same hard-linked file (same inode) as duplicates
+    """
+    # Stage 1: size buckets (one File per inode unless hard links are wanted)
+    size_dict: Dict[int, List[File]] = {}
+    seen_inode_set: Set[Tuple[int, int]] = set()
+    for current_dir, file_entry_lst in iter_dir_listings(dir_name, scan_filter=scan_filter):
+        for entry in file_entry_lst:
+            if entry.is_symlink():  # Shares the data of its target, deleting either is not deduplication
+                continue
+            file = get_file_class(entry.name)(current_dir / entry.name, entry)
+            size = file.size
+            if size is None or size < min_size:
+                continue
+            if not include_hardlinks:
+                file_stat = file.stat()
+                if file_stat.st_nlink > 1 and file_stat.st_ino:
+                    inode_key = (file_stat.st_dev, file_stat.st_ino)
+                    if inode_key in seen_inode_set:
+                        continue
+                    seen_inode_set.add(inode_key)
+            size_dict.setdefault(size, []).append(file)
+
+    candidate_lst = [file for file_lst in size_dict.values() if len(file_lst) > 1 for file in file_lst]
+
+    # Each stage hashes all of its files at once across the pool, then regroups them by (size, digest)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='fileUtils.dedupe') as executor:
+        # Stage 2: hash of both ends of the file
+        digest_lst = executor.map(lambda file: _hash_file_ends(file.path, partial_size, algo), candidate_lst)
+        partial_group_lst = _group_by_digest(candidate_lst, digest_lst)
+
+        # Stage 3: full hash, only when the ends did not already cover the whole file
+        duplicate_group_lst = [file_lst for file_lst in partial_group_lst if file_lst[0].size <= 2 * partial_size]
+        full_candidate_lst = [file for file_lst in partial_group_lst if file_lst[0].size > 2 * partial_size
+                              for file in file_lst]
+        digest_lst = executor.map(lambda file: file.hash(algo), full_candidate_lst)
+        duplicate_group_lst.extend(_group_by_digest(full_candidate_lst, digest_lst))
+
+    duplicate_group_lst.sort(key=lambda file_lst: -file_lst[0].size)
+    return duplicate_group_lst
+
+
+def _group_by_digest(file_lst: List[File], digest_lst: Iterable[Optional[str]]) -> List[List[File]]:
+    """
+    Groups files by (size, digest) (None = unreadable, dropped) and returns the groups of more than one file.
+    """
+    group_dict: Dict[Tuple[int, str], List[File]] = {}
+    for file, digest in zip(file_lst, digest_lst):
+        if digest is not None:
+            group_dict.setdefault((file.size, digest), []).append(file)
+    return [group for group in group_dict.values() if len(group) > 1]
+
+
+def _hash_file_ends(path: Union[str, Path], partial_size: int, algo: str) -> Optional[str]:
+    """
+    Hashes the first and last partial_size bytes of a file (the whole file when it is small enough).
+    """
+    hasher = hashlib.new(algo)
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            hasher.update(f.read(partial_size))
+            size = os.fstat(f.fileno()).st_size
+            if size > partial_size:
+                f.seek(max(partial_size, size - partial_size))
+                hasher.update(f.read(partial_size))
+    except (FileNotFoundError, PermissionError):
+        return None
+    return hasher.hexdigest()
+
+
+class DiskUsage:
+    """
+    Usage of a directory, rolled up (the directory and everything below it).
+    allocated_size is what the files occupy on disk (st_blocks * 512; equal to apparent_size where the OS does not
+    report blocks, e.g. Windows), lower for sparse / compressed files, higher for many small files.
+    """
+    __slots__ = ('apparent_size', 'allocated_size', 'file_count', 'dir_count')
+
+    def __init__(self):
+        self.apparent_size = 0
+        self.allocated_size = 0
+        self.file_count = 0
+        self.dir_count = 0
+
+    def add_size(self, stat_info: os.stat_result):
+        self.apparent_size += stat_info.st_size
+        blocks = getattr(stat_info, 'st_blocks', None)
+        self.allocated_size += stat_info.st_size if blocks is None else blocks * 512
+
+    def add(self, other: 'DiskUsage'):
+        self.apparent_size += other.apparent_size
+        self.allocated_size += other.allocated_size
+        self.file_count += other.file_count
+        self.dir_count += other.dir_count
+
+    def __repr__(self):
+        return (f'DiskUsage(apparent={self.apparent_size}, allocated={self.allocated_size}, '
+                f'files={self.file_count}, dirs={self.dir_count})')
+
+
+def disk_usage(dir_name: Union[str, Path], workers: int = 0) -> Dict[Path, DiskUsage]:
+    """
+    Computes the disk usage of a tree, rolled up per directory (like du), without building File objects.
+    Returns {directory: DiskUsage}, root first (then parents before their sub-folders).
+
+    Every directory is listed once with os.scandir and its entries lstat'ed (links are counted, never followed;
+    free on Windows). As with du, sizes include the folders' own entries. Files with several hard links are counted
+    once (first one seen, by device and inode; Windows listings do not report inodes, so hard links are counted each
+    time there).
+    :param workers: When > 1, directories are listed across a thread pool of that size (for network / large trees)
+    """
+    root = Path(dir_name)
+    usage_dict: Dict[Path, DiskUsage] = {}
+    sub_dir_dict: Dict[Path, List[Path]] = {}
+    inode_set: Set[Tuple[int, int]] = set()
+    lock = threading.Lock()
+    error_lst: List[str] = []
+
+    def scan(dir_path: Path, dir_stat: Optional[os.stat_result]) -> List[Tuple[Path, os.stat_result]]:
+        usage = DiskUsage()
+        if dir_stat is not None:
+            usage.add_size(dir_stat)  # The folder's own entry
+        sub_dir_lst: List[Tuple[Path, os.stat_result]] = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        stat_info = entry.stat(follow_symlinks=False)
+                    except OSError:  # Vanished during the scan
+                        continue
+                    if stat.S_ISDIR(stat_info.st_mode):
+                        sub_dir_lst.append((Path(entry.path), stat_info))
+                        continue
+                    if stat_info.st_nlink > 1:
+                        inode_key = (stat_info.st_dev, stat_info.st_ino)
+                        with lock:
+                            if inode_key in inode_set:
+                                continue
+                            inode_set.add(inode_key)
+                    usage.file_count += 1
+                    usage.add_size(stat_info)
+        except OSError as e:
+            error_lst.append(f'{dir_path}: {e}')
+        usage.dir_count = len(sub_dir_lst)
+        with lock:
+            usage_dict[dir_path] = usage
+            sub_dir_dict[dir_path] = [sub_dir for sub_dir, _ in sub_dir_lst]
+        return sub_dir_lst
+
+    try:
+        root_stat = os.stat(root)
+    except OSError:
+        root_stat = None
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fileUtils.disk_usage') as executor:
+            pending_set = {executor.submit(scan, root, root_stat)}
+            while pending_set:
+                done_set, pending_set = wait(pending_set, return_when=FIRST_COMPLETED)
+                for future in done_set:
+                    pending_set.update(executor.submit(scan, *sub_dir) for sub_dir in future.result())
+    else:
+        dir_stack: List[Tuple[Path, Optional[os.stat_result]]] = [(root, root_stat)]
+        while dir_stack:
+            dir_stack.extend(scan(*dir_stack.pop()))
+
+    # Roll up: a folder is always recorded after its parent, so reversed order has children first
+    for dir_path in reversed(list(usage_dict)):
+        usage = usage_dict[dir_path]
+        for sub_dir in sub_dir_dict[dir_path]:
+            usage.add(usage_dict[sub_dir])
+
+    if error_lst:
+        log(Severity.WARNING, 'fileUtils.disk_usage', f'Could not list {len(error_lst)} folder(s), e.g. {error_lst[0]}')
+    return usage_dict
 
 
 def move_file(src: Path, dest: Path) -> bool:
@@ -316,32 +1503,127 @@ def get_dirs_path_list(dir_path: Union[Path, str]) -> Optional[List[str]]:
         return None
 
     dir_path_lst = []
-    # Get list of items within a directory
-    atlas_sub_dir_item_lst = os.listdir(dir_path_str)
-    # Create a path from items within the directory, and if they are a directory, add them to the directories list.
-    for item in atlas_sub_dir_item_lst:
-        item_dir = str(Path(dir_path_str, item))
-        if os.path.isdir(item_dir):
-            dir_path_lst.append(item_dir)
+    # Get list of items within a directory; scandir gives the type of each item without a stat round-trip
+    with os.scandir(dir_path_str) as it:
+        for entry in it:
+            if entry.is_dir():
+                dir_path_lst.append(str(Path(dir_path_str, entry.name)))
 
     # Sort alphabetically (case-insensitive)
     dir_path_lst.sort(key=lambda s: s.lower())
     return dir_path_lst
 
 
-def create_n_wipe_dir(path: Path):
+def create_n_wipe_dir(path: Path, background: bool = False):
     """
     Creates directory at path if it does not exist, also wipes contents and double-check it's fully empty.
+    :param background: Rename the directory to a sibling trash folder (".trash-<name>-<pid>-<token>"), recreate it
+    empty right away and purge the trash on a background thread. Trash left behind by interrupted runs is purged on
+    the next call. Falls back to the regular wipe when the rename is not possible (symbolic link, mount point, locked).
     """
+    path = Path(path)
+    if background:
+        purge_trash_dirs(path)
     if not os.path.isdir(path):
         make_dir(path)
     if not is_dir_empty(path):
+        if background and _move_dir_to_trash(path):
+            return
         delete_dir_contents(path)
         # Double-Check that it is empty now
         if not is_dir_empty(path):
             log(Severity.CRITICAL, 'fileUtils.create_n_wipe_dir', f'Could not delete dir contents in {path}')
 
 
+def _move_dir_to_trash(path: Path) -> bool:
+    """
+    Renames a directory to a sibling trash folder, recreates it (same permissions) and purges the trash in the
+    background. Returns False (nothing done) if the directory cannot be renamed.
+    """
+    if os.path.islink(path) or os.path.ismount(path):
+        return False
+    if delete_debug_prompt:
+        log(Severity.WARNING, 'Delete Directory Contents', f'Deleting contents of "{path}", proceed?', popup=True)
+    trash_path = path.with_name(f'{trash_dir_prefix}{path.name}-{os.getpid()}-{os.urandom(4).hex()}')
+    try:
+        dir_mode = stat.S_IMODE(os.stat(path).st_mode)
+        os.rename(path, trash_path)
+    except OSError as e:
+        log(Severity.DEBUG, 'fileUtils.create_n_wipe_dir', f'Could not move "{path}" to trash ({e}), wiping in place')
+        return False
+    os.mkdir(path)
+    os.chmod(path, dir_mode)
+    _start_trash_purge(trash_path)
+    return True
+
+
+def _start_trash_purge(trash_path: Path):
+    """
+    Deletes a trash folder on a (non-daemon) thread, so the process still completes the purge before exiting.
+    """
+    with _trash_purge_lock:
+        if trash_path in _trash_purge_dict:
+            return
+        thread = threading.Thread(target=_purge_trash_dir, args=(trash_path,), name='fileUtils.trash_purge')
+        _trash_purge_dict[trash_path] = thread
+    thread.start()
+
+
+def _purge_trash_dir(trash_path: Path):
+    try:
+        log(Severity.DEBUG, 'fileUtils.purge_trash_dirs', f'Purging trash directory: "{trash_path}"')
+        error_lst = _delete_tree(trash_path)
+        if error_lst:
+            log(Severity.WARNING, 'fileUtils.purge_trash_dirs', f'Could not fully purge "{trash_path}": {error_lst[0]}')
+    finally:
+        with _trash_purge_lock:
+            _trash_purge_dict.pop(trash_path, None)
+
+
+def purge_trash_dirs(path: Path):
+    """
+    Starts purging the trash folders left next to a directory by create_n_wipe_dir(background=True), except those
+    still being purged by this process or by another running process.
+    """
+    path = Path(path)
+    prefix = f'{trash_dir_prefix}{path.name}-'
+    try:
+        with os.scandir(path.parent) as it:
+            trash_entry_lst = [entry for entry in it if entry.name.startswith(prefix)]
+    except OSError:
+        return
+    for entry in trash_entry_lst:
+        suffix_lst = entry.name[len(prefix):].split('-')  # "<pid>-<token>" (else trash of "<name>-<other>")
+        if len(suffix_lst) != 2 or not suffix_lst[0].isdigit() or not entry.is_dir(follow_symlinks=False):
+            continue
+        pid = suffix_lst[0]
+        if int(pid) != os.getpid() and _is_pid_running(int(pid)):
+            continue
+        _start_trash_purge(Path(entry.path))
+
+
+def wait_for_trash_purge(timeout: Optional[float] = None):
+    """
+    Blocks until the background trash purges started by this process are done.
+    """
+    with _trash_purge_lock:
+        thread_lst = list(_trash_purge_dict.values())
+    for thread in thread_lst:
+        thread.join(timeout)
+
+
+def _is_pid_running(pid: int) -> bool:
+    if get_os() == OS.WIN:
+        return False  # No signal 0 on Windows (os.kill would terminate it), files in use just fail to delete
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
 def has_subdirectories(path: Path) -> bool:
     return any(item.is_dir() for item in path.iterdir())
 
@@ -358,30 +1640,172 @@ def delete_dir(dir_path: Path) -> bool:
     return not os.path.isdir(dir_path)
 
 
-def delete_dir_contents(dir_path):
+def delete_dir_contents(dir_path, workers: int = 0):
     """
     Deletes the files and folders within a directory (not the directory itself)
+
+    Single bottom-up pass: on POSIX, os.fwalk with directory file descriptors (unlink / rmdir relative to the parent,
+    no path resolution per entry). Permissions are only fixed when a deletion fails with a permission error
+    (read-only file on Windows, non-writable / non-listable folder on POSIX).
+    :param workers: When > 1, the top-level folders are deleted across a thread pool of that size
+    """
+    tool_name = 'fileUtils.delete_dir_contents'
+    dir_path = Path(dir_path)
+    if delete_debug_prompt:
+        log(Severity.WARNING, 'Delete Directory Contents', f'Deleting contents of "{dir_path}", proceed?', popup=True)
+    else:
+        log(Severity.DEBUG, tool_name, f'Deleting contents of directory: "{dir_path}"')
+
+    error_lst: List[str] = []
+    if workers > 1:
+        sub_dir_lst = []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and \
+                        not _has_mount_point_tag(entry.stat(follow_symlinks=False)):
+                    sub_dir_lst.append(Path(entry.path))
+                else:  # Files, symbolic links and junctions (removed, never walked)
+                    _delete_entry(Path(entry.path), error_lst)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fileUtils.delete') as executor:
+            for sub_error_lst in executor.map(_delete_tree, sub_dir_lst):
+                error_lst.extend(sub_error_lst)
+    else:
+        error_lst.extend(_delete_tree_contents(dir_path))
+
+    if not is_dir_empty(dir_path):
+        msg = 'Could not delete every file!'
+        if error_lst:
+            msg += '\n' + '\n'.join(error_lst[:20])
+        log(Severity.CRITICAL, tool_name, msg)
+
+
+def _delete_tree(dir_path: Path) -> List[str]:
+    """
+    Deletes a directory and everything in it; returns the errors met.
     """
-    # Make sure everything is not marked as non-writable
-    for root, dirs, files in os.walk(dir_path):
-        for fname in files:
-            full_path = os.path.join(root, fname)
-            os.chmod(full_path, stat.S_IWRITE)
+    try:
+        error_lst = _delete_tree_contents(dir_path)
+    except PermissionError:  # os.fwalk opens its top folder outside its error handling
+        try:
+            os.chmod(dir_path, stat.S_IRWXU)
+            error_lst = _delete_tree_contents(dir_path)
+        except OSError as e:
+            return [f'{dir_path}: {e}']
+    _delete_entry(dir_path, error_lst, is_dir=True)
+    return error_lst
 
-    # Wipe contents within dir
-    rem_dir_lst = get_dirs_path_list(dir_path)
-    for rem_dir in rem_dir_lst:
-        delete_dir(rem_dir)
 
-    if len(get_dirs_path_list(dir_path)) > 0:
-        log(Severity.CRITICAL, 'fileUtils.delete_dir_contents', 'Could not delete every directory!')
+def _delete_tree_contents(dir_path: Path) -> List[str]:
+    """
+    Deletes everything within a directory in one bottom-up pass; returns the errors met.
+    """
+    error_lst: List[str] = []
+    if not _supports_fd_delete:
+        # Top-down so junctions can be pruned (os.walk descends into them), folders removed deepest first afterwards
+        walked_dir_lst: List[Path] = []
+        for root, dir_name_lst, file_name_lst in os.walk(dir_path):
+            for name in file_name_lst:
+                _delete_entry(Path(root, name), error_lst)
+            for name in list(dir_name_lst):
+                sub_dir = Path(root, name)
+                try:
+                    stat_info = os.lstat(sub_dir)
+                except OSError:
+                    continue
+                if stat.S_ISLNK(stat_info.st_mode) or _has_mount_point_tag(stat_info):
+                    dir_name_lst.remove(name)
+                    _delete_entry(sub_dir, error_lst)  # Removes the link / junction itself, not its target
+                else:
+                    walked_dir_lst.append(sub_dir)
+        for sub_dir in reversed(walked_dir_lst):
+            _delete_entry(sub_dir, error_lst, is_dir=True)
+        return error_lst
+
+    if os.path.islink(dir_path):  # fwalk does not walk a top symbolic link, contents of its target are wiped
+        dir_path = Path(os.path.realpath(dir_path))
+    for root, dir_name_lst, file_name_lst, root_fd in os.fwalk(dir_path, topdown=False):
+        for name in file_name_lst:
+            try:
+                os.unlink(name, dir_fd=root_fd)
+            except FileNotFoundError:
+                pass
+            except PermissionError:
+                _retry_with_writable_dir(os.unlink, name, root_fd, root, error_lst)
+            except OSError as e:
+                error_lst.append(f'{os.path.join(root, name)}: {e}')
+
+        for name in dir_name_lst:
+            try:
+                os.rmdir(name, dir_fd=root_fd)
+            except FileNotFoundError:
+                pass
+            except NotADirectoryError:  # Symbolic link to a directory (listed with the folders, not walked)
+                try:
+                    os.unlink(name, dir_fd=root_fd)
+                except PermissionError:
+                    _retry_with_writable_dir(os.unlink, name, root_fd, root, error_lst)
+                except OSError as e:
+                    error_lst.append(f'{os.path.join(root, name)}: {e}')
+            except PermissionError:
+                _retry_with_writable_dir(os.rmdir, name, root_fd, root, error_lst)
+            except OSError as e:
+                if e.errno != errno.ENOTEMPTY:
+                    error_lst.append(f'{os.path.join(root, name)}: {e}')
+                    continue
+                # Folder fwalk could not list (no read / exec permission): open it up and delete it on its own
+                sub_dir = Path(root, name)
+                try:
+                    os.chmod(sub_dir, stat.S_IRWXU)
+                except OSError as chmod_error:
+                    error_lst.append(f'{sub_dir}: {chmod_error}')
+                    continue
+                error_lst.extend(_delete_tree(sub_dir))
+    return error_lst
+
+
+def _has_mount_point_tag(stat_info: os.stat_result) -> bool:
+    """
+    Windows: whether an lstat result is a junction / volume mount point (is_dir and os.walk do not tell them apart).
+    """
+    return getattr(stat_info, 'st_reparse_tag', 0) == IO_REPARSE_TAG_MOUNT_POINT
 
-    rem_file_lst: List[File] = get_file_list_from_path(dir_path)
-    for rem_file in rem_file_lst:
-        rem_file.delete_file()
 
-    if len(get_file_list_from_path(dir_path)) > 0:
-        log(Severity.CRITICAL, 'fileUtils.delete_dir_contents', 'Could not delete every file!')
+def _retry_with_writable_dir(func: Callable, name: str, dir_fd: int, dir_path: str, error_lst: List[str]):
+    """
+    Makes a folder writable (by its descriptor) and retries a deletion within it.
+    """
+    try:
+        dir_mode = os.stat(dir_fd).st_mode
+        os.chmod(dir_fd, dir_mode | stat.S_IWUSR | stat.S_IXUSR)
+        func(name, dir_fd=dir_fd)
+    except OSError as e:
+        error_lst.append(f'{os.path.join(dir_path, name)}: {e}')
+
+
+def _delete_entry(path: Path, error_lst: List[str], is_dir: bool = False):
+    """
+    Deletes one file / link / empty folder by path; retries once after fixing permissions if refused.
+    """
+    func = os.rmdir if is_dir and not os.path.islink(path) else os.unlink
+    try:
+        func(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        try:
+            if get_os() == OS.WIN:
+                os.chmod(path, stat.S_IWRITE)  # Clear read-only attribute
+            else:
+                os.chmod(path.parent, os.stat(path.parent).st_mode | stat.S_IWUSR | stat.S_IXUSR)
+            func(path)
+        except OSError as e:
+            error_lst.append(f'{path}: {e}')
+    except OSError as e:
+        error_lst.append(f'{path}: {e}')
+
+
+_supports_fd_delete = (os.unlink in os.supports_dir_fd and os.rmdir in os.supports_dir_fd and
+                       hasattr(os, 'fwalk') and os.chmod in os.supports_fd)
 
 
 def delete_file(file_path) -> bool:
@@ -459,37 +1883,37 @@ def update_symbolic_link(source: Path, destination: Path, allow_destination_dele
         return
 
     # If there is something there other than a symbolic link, wipe it (if authorized)
-    if os.path.exists(destination) and not is_symbolic_link(destination):
+    destination_kind = classify_path(destination)
+    if destination_kind not in (PathKind.MISSING, PathKind.SYMLINK):
         if not allow_destination_deletion:
             msg += '\nDestination already exists (And "allow_destination_deletion" is not enabled); Aborting!'
             log(Severity.ERROR, tool_name, msg)
             return
         else:
-            if is_junction(destination):
-                msg += '\nDestination is junction; unsure how to delete as of yet; Aborting!'
-                log(Severity.ERROR, tool_name, msg)
-                return
-            # elif is_hard_link(destination):
-            #     print(f'{tool_name}: Destination is hard link, unsure how to delete as of yet!')
-            elif os.path.isfile(destination):
-                msg += '\nDestination is a file, not expected for Symbolic Link creation. Aborting!'
-                log(Severity.ERROR, tool_name, msg)
-                return
-            elif is_mount_point(destination):
-                msg += '\nDestination is a mount point, unsure how to delete as of yet!'
-                # delete_symbolic_link(destination)
-                log(Severity.ERROR, tool_name, msg)
-                return
-            elif is_dir(destination):
-                msg += '\nDestination is a directory! Deleting...'
-                delete_dir(destination)
-            else:
-                msg += '\nDestination is unknown type, unsure how to delete as of yet!'
-                log(Severity.ERROR, tool_name, msg)
-                return
+            match destination_kind:
+                case PathKind.JUNCTION:
+                    msg += '\nDestination is junction; unsure how to delete as of yet; Aborting!'
+                    log(Severity.ERROR, tool_name, msg)
+                    return
+                case PathKind.FILE:
+                    msg += '\nDestination is a file, not expected for Symbolic Link creation. Aborting!'
+                    log(Severity.ERROR, tool_name, msg)
+                    return
+                case PathKind.MOUNT:
+                    msg += '\nDestination is a mount point, unsure how to delete as of yet!'
+                    log(Severity.ERROR, tool_name, msg)
+                    return
+                case PathKind.DIR:
+                    msg += '\nDestination is a directory! Deleting...'
+                    delete_dir(destination)
+                    destination_kind = PathKind.MISSING
+                case _:
+                    msg += '\nDestination is unknown type, unsure how to delete as of yet!'
+                    log(Severity.ERROR, tool_name, msg)
+                    return
 
     # If it's a symbolic link, see if path matches expected
-    if is_symbolic_link(destination):
+    if destination_kind == PathKind.SYMLINK:
         destination_link_path = os.path.realpath(destination)
         if str(Path(destination_link_path)) != str(source):
             msg += '\nSymbolic Link exists at destination, but doesn\'t match expected destination. Updating...'
@@ -509,6 +1933,192 @@ def update_symbolic_link(source: Path, destination: Path, allow_destination_dele
         log(Severity.DEBUG, tool_name, msg)
 
 
+class LinkReport:
+    """
+    Result of reconcile_links.
+    """
+    def __init__(self):
+        self.created_lst: List[Path] = []
+        self.updated_lst: List[Path] = []
+        self.deleted_lst: List[Path] = []
+        self.unchanged_count = 0
+        self.error_lst: List[Tuple[Path, str]] = []  # (destination, error)
+
+    def __repr__(self):
+        return (f'LinkReport(created={len(self.created_lst)}, updated={len(self.updated_lst)}, '
+                f'deleted={len(self.deleted_lst)}, unchanged={self.unchanged_count}, errors={len(self.error_lst)})')
+
+
+def reconcile_links(manifest: Dict[Union[str, Path], Optional[Union[str, Path]]],
+                    allow_destination_deletion: bool = False, prune: bool = False,
+                    dry_run: bool = False) -> LinkReport:
+    """
+    Brings many symbolic links to the state described by a manifest ({destination: source}), in one batch.
+    Bulk version of update_symbolic_link: each destination folder is listed once, links are compared with readlink
+    (correct links are not touched or stat'ed again) and only the needed create / update / delete are applied.
+    Links are created to the resolved source, updated links are swapped in atomically (macOS / Linux).
+
+    :param manifest: {destination: source}; a None source means the link at destination must not exist
+    :param allow_destination_deletion: Delete a real directory found where a link is expected
+    :param prune: Also delete symbolic links, in the manifest's destination folders, that the manifest does not list
+    :param dry_run: Only compute the report (what would be done), change nothing
+    """
+    tool_name = 'fileUtils.reconcile_links'
+    report = LinkReport()
+
+    # Desired link targets (sources resolved once each)
+    resolved_dict: Dict[Path, Optional[str]] = {}
+    parent_dict: Dict[Path, Dict[str, Optional[str]]] = {}
+    for destination, source in manifest.items():
+        destination = Path(destination)
+        target = None
+        if source is not None:
+            source = Path(source)
+            if source not in resolved_dict:
+                try:
+                    resolved_dict[source] = os.path.realpath(source, strict=True)
+                except OSError:
+                    resolved_dict[source] = None
+            target = resolved_dict[source]
+            if target is None:
+                report.error_lst.append((destination, f'Source does not exist: "{source}"'))
+                continue
+        parent_dict.setdefault(destination.parent, {})[destination.name] = target
+
+    # Plan, one listing per destination folder
+    create_lst: List[Tuple[Path, str]] = []
+    update_lst: List[Tuple[Path, str]] = []
+    delete_lst: List[Path] = []
+    delete_dir_lst: List[Path] = []
+    make_dir_lst: List[Path] = []
+    for parent, target_dict in parent_dict.items():
+        try:
+            with os.scandir(parent) as it:
+                entry_dict = {entry.name: entry for entry in it if entry.name in target_dict or
+                              (prune and entry.is_symlink())}
+        except FileNotFoundError:
+            entry_dict = {}
+            if any(target is not None for target in target_dict.values()):
+                make_dir_lst.append(parent)
+        except OSError as e:
+            report.error_lst.extend((Path(parent, name), str(e)) for name in target_dict)
+            continue
+        parent_dev = None
+
+        for name, entry in entry_dict.items():
+            if name not in target_dict:  # Unmanaged link (prune)
+                delete_lst.append(Path(entry.path))
+        for name, target in target_dict.items():
+            destination = Path(parent, name)
+            entry = entry_dict.get(name)
+            if entry is None:
+                if target is not None:
+                    create_lst.append((destination, target))
+                else:
+                    report.unchanged_count += 1
+                continue
+            if parent_dev is None and get_os() != OS.WIN:
+                parent_dev = os.stat(parent).st_dev
+            kind = _classify_entry(entry, parent_dev, detect_mounts=True)
+            if kind == PathKind.SYMLINK:
+                if target is None:
+                    delete_lst.append(destination)
+                elif _is_link_to(entry, target):
+                    report.unchanged_count += 1
+                else:
+                    update_lst.append((destination, target))
+            elif kind == PathKind.MISSING:
+                if target is not None:
+                    create_lst.append((destination, target))
+            elif kind == PathKind.DIR and target is not None and allow_destination_deletion:
+                delete_dir_lst.append(destination)
+                create_lst.append((destination, target))
+            elif target is None:
+                report.error_lst.append((destination, f'Not a symbolic link ({kind.value}), not deleting'))
+            else:
+                report.error_lst.append((destination, f'Destination is a {kind.value.lower()}, not a symbolic link'))
+
+    if dry_run:
+        report.created_lst = [destination for destination, _ in create_lst]
+        report.updated_lst = [destination for destination, _ in update_lst]
+        report.deleted_lst = delete_lst + delete_dir_lst
+        return report
+
+    # Apply
+    for parent in make_dir_lst:
+        try:
+            make_dir(parent)
+        except OSError as e:
+            report.error_lst.append((parent, str(e)))
+    for dir_path in delete_dir_lst:
+        try:
+            rmtree(dir_path)
+            report.deleted_lst.append(dir_path)
+        except OSError as e:
+            report.error_lst.append((dir_path, str(e)))
+    for destination in delete_lst:
+        try:
+            os.unlink(destination)
+            report.deleted_lst.append(destination)
+        except FileNotFoundError:
+            report.deleted_lst.append(destination)
+        except OSError as e:
+            report.error_lst.append((destination, str(e)))
+    for destination, target in create_lst:
+        try:
+            _make_symlink(target, destination)
+            report.created_lst.append(destination)
+        except OSError as e:
+            report.error_lst.append((destination, str(e)))
+    for destination, target in update_lst:
+        try:
+            _replace_symlink(target, destination)
+            report.updated_lst.append(destination)
+        except OSError as e:
+            report.error_lst.append((destination, str(e)))
+
+    log(Severity.DEBUG, tool_name, repr(report))
+    for destination, error in report.error_lst[:20]:
+        log(Severity.WARNING, tool_name, f'"{destination}": {error}')
+    return report
+
+
+def _is_link_to(entry: os.DirEntry, target: str) -> bool:
+    """
+    Whether a symbolic link points to target (already resolved); resolves the link only if its text differs.
+    """
+    try:
+        link_text = os.readlink(entry.path)
+    except OSError:
+        return False
+    if link_text == target:
+        return True
+    return os.path.realpath(entry.path) == target
+
+
+def _make_symlink(target: str, destination: Path):
+    # Windows needs to know if the link is to a directory
+    os.symlink(target, destination, target_is_directory=get_os() == OS.WIN and os.path.isdir(target))
+
+
+def _replace_symlink(target: str, destination: Path):
+    """
+    Points an existing symbolic link to a new target; on macOS / Linux, a new link is renamed over the old one, so
+    the destination always exists.
+    """
+    if get_os() == OS.WIN:
+        os.unlink(destination)
+        _make_symlink(target, destination)
+        return
+    temp_path = destination.with_name(f'.{destination.name}.{os.urandom(4).hex()}.tmp')
+    _make_symlink(target, temp_path)
+    try:
+        os.replace(temp_path, destination)
+    except OSError:
+        os.unlink(temp_path)
+        raise
+
+
 def is_junction(path: Union[str, Path]):
     if get_os() == OS.WIN:
         return junctionUtils.is_junction(path)
@@ -524,44 +2134,128 @@ def is_symbolic_link(path: Union[str, Path]):
 
 
 def is_mount_point(path: Union[str, Path]):
+    """
+    Windows only: whether the path carries a "Mount Point" reparse tag (volume mount point or junction)
+    """
     if get_os() != OS.WIN:
         return False
 
-    # Convert type
-    if isinstance(path, str):
-        path_str = path
-    elif isinstance(path, Path):
-        path_str = str(path)
-    else:
+    if not isinstance(path, (str, Path)):
         print('Wrong type!')
         return None
 
-    # FSUTIL QUERY
-    output_lines = cmdShellWrapper.exec_cmd(f'fsutil reparsepoint query "{path_str}"')
-    for line in output_lines:
-        if line == 'Tag value: Mount Point':
-            return True
-    return False
+    # Reparse tag from lstat (same tag "fsutil reparsepoint query" reports as "Mount Point")
+    try:
+        return os.lstat(path).st_reparse_tag == IO_REPARSE_TAG_MOUNT_POINT
+    except OSError:
+        return False
 
 
 def is_dir(path: Union[str, Path]):
     """
     Returns whether a path is a directory.
     More accurate than os.path.isdir as it will return False if the target is a junction, symbolic link or hard link
+    (Single lstat; on macOS / Linux, mounted directories are still considered directories)
     """
+    return classify_path(path, detect_mounts=False) == PathKind.DIR
+
+
+class PathKind(Enum):
+    FILE = 'File'
+    DIR = 'Directory'
+    SYMLINK = 'Symbolic Link'
+    JUNCTION = 'Junction'
+    MOUNT = 'Mount Point'
+    MISSING = 'Missing'
+    OTHER = 'Other'  # Device, pipe, socket, other reparse point...
+
+
+def classify_path(path: Union[str, Path], detect_mounts: bool = True) -> PathKind:
+    """
+    Classifies a path (without following links) from a single lstat.
+    Windows junctions and volume mount points come from the reparse tag; on macOS / Linux, a directory is a mount
+    point when its device differs from its parent's (one more stat, skipped when detect_mounts is False).
+    """
+    try:
+        stat_info = os.lstat(path)
+    except (OSError, ValueError):
+        return PathKind.MISSING
+    return _classify_stat(path, stat_info, detect_mounts=detect_mounts)
+
+
+def classify_many(path_lst: Iterable[Union[str, Path]], detect_mounts: bool = True) -> Dict[Path, PathKind]:
+    """
+    Classifies many paths, batched per parent directory: a parent holding at least classify_scan_min_count of the
+    paths is listed once (os.scandir) and its entries classified from the listing (file type, and on Windows the
+    reparse tag, come with it); the parent is also stat'ed once for mount detection. Smaller groups use classify_path.
+    """
+    kind_dict: Dict[Path, PathKind] = {}
+    parent_dict: Dict[Path, List[Path]] = {}
+    for path in path_lst:
+        path = Path(path)
+        parent_dict.setdefault(path.parent, []).append(path)
+
+    for parent, group_lst in parent_dict.items():
+        entry_dict: Dict[str, os.DirEntry] = {}
+        parent_dev = None
+        if len(group_lst) >= classify_scan_min_count:
+            name_set = {path.name for path in group_lst}
+            try:
+                with os.scandir(parent) as it:
+                    entry_dict = {entry.name: entry for entry in it if entry.name in name_set}
+                if detect_mounts and get_os() != OS.WIN:
+                    parent_dev = os.stat(parent).st_dev
+            except OSError:
+                entry_dict = {}
+
+        for path in group_lst:
+            entry = entry_dict.get(path.name)
+            if entry is None:  # Not batched, or name not listed as given (case-insensitive file system, "..")
+                kind_dict[path] = classify_path(path, detect_mounts)
+            else:
+                kind_dict[path] = _classify_entry(entry, parent_dev, detect_mounts)
+    return kind_dict
 
-    if not os.path.isdir(path):
-        return False
-    # elif is_hard_link(path):
-    #     return False
-    elif is_junction(path):
-        return False
-    elif is_mount_point(path):
-        return False
-    elif is_symbolic_link(path):
-        return False
-    else:
-        return True
+
+def _classify_entry(entry: os.DirEntry, parent_dev: Optional[int], detect_mounts: bool) -> PathKind:
+    try:
+        if get_os() == OS.WIN:  # Stat of a Windows DirEntry (reparse tag included) is free
+            return _classify_stat(entry.path, entry.stat(follow_symlinks=False), detect_mounts=False)
+        if entry.is_symlink():
+            return PathKind.SYMLINK
+        if entry.is_file(follow_symlinks=False):
+            return PathKind.FILE
+        if entry.is_dir(follow_symlinks=False):
+            if detect_mounts and parent_dev is not None and entry.stat(follow_symlinks=False).st_dev != parent_dev:
+                return PathKind.MOUNT
+            return PathKind.DIR
+        entry.stat(follow_symlinks=False)  # Raises if the entry is gone
+        return PathKind.OTHER
+    except OSError:
+        return PathKind.MISSING
+
+
+def _classify_stat(path: Union[str, Path], stat_info: os.stat_result, detect_mounts: bool = True) -> PathKind:
+    if getattr(stat_info, 'st_reparse_tag', 0) == IO_REPARSE_TAG_MOUNT_POINT:
+        try:  # Junctions and volume mount points share the tag; volume targets are "\\?\Volume{GUID}\"
+            is_volume = os.readlink(path).startswith('\\\\?\\Volume{')
+        except OSError:
+            is_volume = False
+        return PathKind.MOUNT if is_volume else PathKind.JUNCTION
+    if stat.S_ISLNK(stat_info.st_mode):
+        return PathKind.SYMLINK
+    if stat.S_ISREG(stat_info.st_mode):
+        return PathKind.FILE
+    if stat.S_ISDIR(stat_info.st_mode):
+        if detect_mounts and get_os() != OS.WIN:
+            try:
+                parent_stat = os.lstat(os.path.join(path, '..'))
+            except OSError:
+                return PathKind.DIR
+            if parent_stat.st_dev != stat_info.st_dev or parent_stat.st_ino == stat_info.st_ino:  # Or root
+                return PathKind.MOUNT
+        return PathKind.DIR
+    return PathKind.OTHER
 
 
 def get_split_character():
@@ -625,9 +2319,180 @@ def rename_file(original_name: Path, new_name: Path, force: bool = False) -> boo
         return False
 
 
-def copy_file(source: Union[str, Path], destination: Union[str, Path]) -> bool:
+def rename_many(mapping: Dict[Union[str, Path], Union[str, Path]], overwrite: bool = False,
+                dry_run: bool = False) -> Dict[Path, Optional[str]]:
+    """
+    Renames / moves many files or folders ({source: destination}) as one plan: the whole plan is validated first
+    (missing sources, two sources to one destination, destinations already taken), chains (a -> b, b -> c) are run
+    in order and cycles (a -> b, b -> a) are broken with a temporary name
+    (moved back if the cycle cannot complete). Missing destination folders are created once each. Existence checks
+    come from one listing per folder holding many of the paths.
+    Returns {source: None if renamed (or would be, with dry_run), else the reason it was not}.
+
+    :param overwrite: Replace destinations that exist and are not themselves renamed away by the plan
+    """
+    tool_name = 'fileUtils.rename_many'
+    result_dict: Dict[Path, Optional[str]] = {}
+    given_dict: Dict[Path, Path] = {}  # {absolute source: source as given}
+    plan_dict: Dict[Path, Path] = {}  # {absolute source: absolute destination}
+    for source, destination in mapping.items():
+        given = Path(source)
+        source = Path(os.path.abspath(source))
+        destination = Path(os.path.abspath(destination))
+        given_dict[source] = given
+        result_dict[given] = None
+        if source != destination:
+            plan_dict[source] = destination
+
+    # Existence, from listings of the folders holding many paths (single lexists otherwise)
+    count_dict: Dict[Path, int] = {}
+    for path in chain(plan_dict, plan_dict.values()):
+        count_dict[path.parent] = count_dict.get(path.parent, 0) + 1
+    listing_dict: Dict[Path, Optional[Tuple[Set[str], Set[str]]]] = {}  # {folder: (names, case-folded names)}
+    missing_dir_set: Set[Path] = set()
+
+    def exists(path: Path) -> bool:
+        if path.parent in missing_dir_set:
+            return False
+        if count_dict.get(path.parent, 0) >= classify_scan_min_count:
+            if path.parent not in listing_dict:
+                try:
+                    name_lst = os.listdir(path.parent)
+                    listing_dict[path.parent] = (set(name_lst), {name.casefold() for name in name_lst})
+                except FileNotFoundError:
+                    missing_dir_set.add(path.parent)
+                    return False
+                except OSError:
+                    listing_dict[path.parent] = None
+            listing = listing_dict[path.parent]
+            if listing is not None:
+                if path.name in listing[0]:
+                    return True
+                if get_os() == OS.LINUX or path.name.casefold() not in listing[1]:
+                    return False
+        return os.path.lexists(path)  # Not listed, or other case of a listed name (case-insensitive file system)
+
+    def fail(source: Path, reason: str):
+        result_dict[given_dict[source]] = reason
+        plan_dict.pop(source, None)
+
+    # Validate the whole plan
+    source_by_dst_dict: Dict[Path, Path] = {}
+    for source, destination in list(plan_dict.items()):
+        if destination in source_by_dst_dict:
+            fail(source_by_dst_dict[destination], f'Same destination as "{given_dict[source]}"')
+            fail(source, f'Same destination as "{given_dict[source_by_dst_dict[destination]]}"')
+        source_by_dst_dict.setdefault(destination, source)
+    for source, destination in list(plan_dict.items()):
+        if not exists(source):
+            fail(source, 'Source does not exist')
+    for source, destination in list(plan_dict.items()):
+        if destination in plan_dict or overwrite or not exists(destination):
+            continue
+        if os.path.normcase(str(destination)) == os.path.normcase(str(source)) or \
+                _is_same_entry(source, destination):
+            continue  # Case change of the same entry
+        fail(source, f'Destination exists: "{destination}"')
+    # Sources blocked by a failed source they would overwrite (chain / cycle through it)
+    blocked = True
+    while blocked:
+        blocked = False
+        for source, destination in list(plan_dict.items()):
+            if destination in given_dict and destination not in plan_dict and \
+                    result_dict[given_dict[destination]] is not None:
+                fail(source, f'Blocked: "{given_dict[destination]}" is not renamed')
+                blocked = True
+
+    # Order: chain ends first; cycles broken by moving one of their members aside
+    step_lst: List[Tuple[Path, Path, Path]] = []  # (from, to, source it belongs to)
+    temp_path_set: Set[Path] = set()
+    pending_dict: Dict[Path, Tuple[Path, Path]] = {source: (source, destination)  # {location: (source, destination)}
+                                                   for source, destination in plan_dict.items()}
+    mover_dict = {destination: source for source, destination in plan_dict.items()}  # {path: location moving in}
+    ready_lst = [source for source, destination in plan_dict.items() if destination not in plan_dict]
+    while pending_dict:
+        if not ready_lst:  # Only cycles left
+            location, (source, destination) = next(iter(pending_dict.items()))
+            temp_path = destination.with_name(f'.{destination.name}.{os.urandom(4).hex()}.rename')
+            del pending_dict[location]
+            pending_dict[temp_path] = (source, destination)
+            mover_dict[destination] = temp_path
+            temp_path_set.add(temp_path)
+            step_lst.append((location, temp_path, source))
+        else:
+            location = ready_lst.pop()
+            source, destination = pending_dict.pop(location)
+            step_lst.append((location, destination, source))
+        mover = mover_dict.get(location)  # Location now free: what was waiting for it can go
+        if mover in pending_dict:
+            ready_lst.append(mover)
+
+    if dry_run:
+        return result_dict
+
+    # Destination folders, created once each
+    for dir_path in sorted({destination.parent for destination in plan_dict.values()}, key=lambda p: len(p.parts)):
+        if dir_path in missing_dir_set or (dir_path not in listing_dict and not os.path.isdir(dir_path)):
+            try:
+                os.makedirs(dir_path, exist_ok=True)
+            except OSError as e:
+                for source, destination in list(plan_dict.items()):
+                    if destination.parent == dir_path:
+                        result_dict[given_dict[source]] = f'Could not create folder: {e}'
+
+    # Execute; a failed step leaves its source in place, so whatever would overwrite it is skipped
+    rename_func = os.replace if overwrite else os.rename
+    failed_path_set: Set[Path] = set()
+    moved_aside_dict: Dict[Path, Tuple[Path, Path]] = {}  # {source: (original location, temporary name)}
+    for from_path, to_path, source in step_lst:
+        given = given_dict[source]
+        if result_dict[given] is not None:
+            failed_path_set.add(from_path)
+            continue
+        if to_path in failed_path_set:
+            result_dict[given] = f'Blocked: "{to_path}" could not be renamed'
+            failed_path_set.add(from_path)
+            continue
+        try:
+            rename_func(from_path, to_path)
+        except OSError as e:
+            result_dict[given] = str(e)
+            failed_path_set.add(from_path)
+            continue
+        if to_path in temp_path_set:
+            moved_aside_dict[source] = (from_path, to_path)
+
+    # Cycle members moved aside whose final step did not happen go back where they were
+    for source, (location, temp_path) in moved_aside_dict.items():
+        given = given_dict[source]
+        if result_dict[given] is None:
+            continue
+        try:
+            if os.path.lexists(location):
+                raise FileExistsError(errno.EEXIST, 'Original location is taken', str(location))
+            os.rename(temp_path, location)
+        except OSError as e:
+            result_dict[given] = f'{result_dict[given]}; left at temporary name "{temp_path}" ({e})'
+
+    failed_count = sum(1 for reason in result_dict.values() if reason is not None)
+    log(Severity.DEBUG, tool_name, f'Renamed {len(result_dict) - failed_count} item(s), {failed_count} failed')
+    return result_dict
+
+
+def _is_same_entry(path_a: Path, path_b: Path) -> bool:
+    try:
+        return os.path.samestat(os.lstat(path_a), os.lstat(path_b))
+    except OSError:
+        return False
+
+
+def copy_file(source: Union[str, Path], destination: Union[str, Path],
+              progress_callback: Optional[Callable[[int], None]] = None) -> bool:
     """
     Copy a file from source to destination.
+    See copy_file_contents for how the bytes are copied.
+
+    :param progress_callback: Called with the number of bytes copied so far, as the copy progresses
 
     Returns:
         True if the file was copied successfully.
@@ -642,7 +2507,7 @@ def copy_file(source: Union[str, Path], destination: Union[str, Path]) -> bool:
 
         log(Severity.DEBUG, 'fileUtils.copy_file', f'Copying file from "{source}" to "{destination}"')
 
-        copyfile(source, destination)
+        copy_file_contents(source, destination, progress_callback)
         return True
 
     except (OSError, IOError) as error:
@@ -650,6 +2515,480 @@ def copy_file(source: Union[str, Path], destination: Union[str, Path]) -> bool:
         return False
 
 
+class SyncStats:
+    """
+    Result of sync_tree.
+    """
+    def __init__(self):
+        self.copied_count = 0
+        self.copied_bytes = 0
+        self.linked_count = 0  # snapshot_tree: files hard linked to the previous snapshot
+        self.unchanged_count = 0
+        self.deleted_count = 0
+        self.created_dir_count = 0
+        self.error_lst: List[Tuple[str, str]] = []  # (relative path, error)
+
+    def __repr__(self):
+        return (f'SyncStats(copied={self.copied_count} ({self.copied_bytes} bytes), linked={self.linked_count}, '
+                f'unchanged={self.unchanged_count}, deleted={self.deleted_count}, '
+                f'created_dirs={self.created_dir_count}, errors={len(self.error_lst)})')
+
+
+def sync_tree(source: Union[str, Path], destination: Union[str, Path], delete_extra: bool = False,
+              use_hash: bool = False, workers: int = 8, scan_filter: Optional[ScanFilter] = None,
+              modify_window: float = 0.0, parallel_scan: int = 0) -> SyncStats:
+    """
+    Mirrors a directory tree into another one, copying only new / changed files (rsync style).
+
+    Both trees are scanned once; a file is copied when it is missing, or its size or mtime differs (or, with
+    use_hash, when same-size files have different contents). Missing folders are created in one pass up front,
+    then copies run across a pool of workers. Copies get the mtime and permissions of their source, so the next
+    run skips them; they are written to a temporary name and renamed over the old file (read-only files can still
+    be updated, an interrupted copy never leaves a half-written file).
+
+    :param delete_extra: Delete files / (emptied) folders of destination that are not in source
+    :param use_hash: Compare same-size files by content hash instead of mtime
+    :param scan_filter: Only consider matching files (also applies to what delete_extra may delete)
+    :param modify_window: mtime difference (seconds) still considered equal (e.g. 2 for FAT / some SMB shares)
+    :param parallel_scan: Number of threads listing directories (see iter_dir_listings)
+    """
+    tool_name = 'fileUtils.sync_tree'
+    source = Path(source)
+    destination = Path(destination)
+    stats = SyncStats()
+    window_ns = int(modify_window * 1_000_000_000)
+
+    src_file_dict, src_dir_set = _scan_tree_stats(source, scan_filter, parallel_scan)
+    destination_exists = destination.is_dir()
+    if destination_exists:
+        dst_file_dict, dst_dir_set = _scan_tree_stats(destination, scan_filter, parallel_scan)
+    else:
+        dst_file_dict, dst_dir_set = {}, set()
+
+    # Decide what to copy
+    copy_lst: List[Tuple[str, os.stat_result]] = []
+    hash_check_lst: List[Tuple[str, os.stat_result, os.stat_result]] = []
+    for rel_path, src_stat in src_file_dict.items():
+        dst_stat = dst_file_dict.get(rel_path)
+        if dst_stat is None or dst_stat.st_size != src_stat.st_size:
+            copy_lst.append((rel_path, src_stat))
+        elif use_hash:
+            hash_check_lst.append((rel_path, src_stat, dst_stat))
+        elif abs(dst_stat.st_mtime_ns - src_stat.st_mtime_ns) > window_ns:
+            copy_lst.append((rel_path, src_stat))
+        else:
+            stats.unchanged_count += 1
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='fileUtils.sync') as executor:
+        if hash_check_lst:
+            def same_contents(item) -> bool:
+                rel_path, src_stat, dst_stat = item
+                return (File(Path(source, rel_path), src_stat).hash() ==
+                        File(Path(destination, rel_path), dst_stat).hash())
+            for item, is_same in zip(hash_check_lst, executor.map(same_contents, hash_check_lst)):
+                if is_same:
+                    stats.unchanged_count += 1
+                else:
+                    copy_lst.append(item[:2])
+
+        # Create missing folders once, parents first (destination itself too)
+        for rel_dir in chain([] if destination_exists else [''], sorted(src_dir_set.difference(dst_dir_set))):
+            try:
+                os.makedirs(Path(destination, rel_dir), exist_ok=True)
+                stats.created_dir_count += 1
+            except OSError as e:
+                stats.error_lst.append((rel_dir, str(e)))
+
+        def copy_task(item) -> Optional[str]:
+            rel_path, src_stat = item
+            try:
+                _copy_file_with_metadata(Path(source, rel_path), Path(destination, rel_path), src_stat)
+            except OSError as e:
+                return str(e)
+            return None
+
+        for (rel_path, src_stat), error in zip(copy_lst, executor.map(copy_task, copy_lst)):
+            if error is None:
+                stats.copied_count += 1
+                stats.copied_bytes += src_stat.st_size
+            else:
+                stats.error_lst.append((rel_path, error))
+
+    if delete_extra:
+        for rel_path in dst_file_dict.keys() - src_file_dict.keys():
+            try:
+                os.unlink(Path(destination, rel_path))
+                stats.deleted_count += 1
+            except OSError as e:
+                stats.error_lst.append((rel_path, str(e)))
+        # Deepest first; folders still holding (filtered out) files are kept
+        for rel_dir in sorted(dst_dir_set.difference(src_dir_set), reverse=True):
+            try:
+                os.rmdir(Path(destination, rel_dir))
+                stats.deleted_count += 1
+            except OSError:
+                pass
+
+    for rel_path, error in stats.error_lst:
+        log(Severity.ERROR, tool_name, f'"{rel_path}": {error}')
+    log(Severity.DEBUG, tool_name, f'Synced "{source}" to "{destination}": {stats}')
+    return stats
+
+
+def _copy_file_with_metadata(source: Path, destination: Path, src_stat: os.stat_result):
+    """
+    Copies a file (copy_file_contents) to a temporary name next to destination, gives it the permissions and mtime of
+    source (src_stat), then renames it over destination. Raises OSError on failure (the temporary file is removed).
+    """
+    temp_path = destination.with_name(f'.{destination.name}.{os.urandom(4).hex()}.tmp')
+    try:
+        copy_file_contents(source, temp_path)
+        os.chmod(temp_path, stat.S_IMODE(src_stat.st_mode))
+        os.utime(temp_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        try:
+            os.replace(temp_path, destination)
+        except PermissionError:
+            if get_os() != OS.WIN:
+                raise
+            os.chmod(destination, stat.S_IWRITE)  # Windows does not replace read-only files
+            os.replace(temp_path, destination)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def snapshot_tree(source: Union[str, Path], destination: Union[str, Path],
+                  link_dest: Union[str, Path, None] = None, workers: int = 8,
+                  scan_filter: Optional[ScanFilter] = None, modify_window: float = 0.0,
+                  parallel_scan: int = 0) -> SyncStats:
+    """
+    Makes a snapshot of a tree in a new (or empty) destination, rsync --link-dest style: the folder structure is
+    recreated, files unchanged since the previous snapshot (link_dest: same relative path, size, mtime and mode) are
+    hard linked to it, only new / changed files are copied (copy_file_contents, then mtime and permissions).
+    Successive snapshots then cost the changed files only, each one still a full tree.
+
+    Hard linked files are shared between snapshots: modifying one in place modifies it in every snapshot (replacing
+    it does not). When a hard link cannot be made (other file system, link count limit...), the file is copied.
+
+    :param link_dest: Previous snapshot of the same source (None: every file is copied)
+    :param scan_filter: Only snapshot matching files
+    :param modify_window: mtime difference (seconds) still considered equal
+    :param parallel_scan: Number of threads listing directories (see iter_dir_listings)
+    """
+    tool_name = 'fileUtils.snapshot_tree'
+    source = Path(source)
+    destination = Path(destination)
+    stats = SyncStats()
+    window_ns = int(modify_window * 1_000_000_000)
+
+    if destination.is_dir() and not is_dir_empty(destination):
+        log(Severity.ERROR, tool_name, f'Snapshot destination is not empty: "{destination}"')
+        stats.error_lst.append(('', 'Destination is not empty'))
+        return stats
+
+    src_file_dict, src_dir_set = _scan_tree_stats(source, scan_filter, parallel_scan)
+    if link_dest is not None and Path(link_dest).is_dir():
+        link_dest = Path(link_dest)
+        prev_file_dict, _ = _scan_tree_stats(link_dest, scan_filter, parallel_scan)
+    else:
+        link_dest = None
+        prev_file_dict = {}
+
+    # Folders first, parents first
+    for rel_dir in chain([''], sorted(src_dir_set)):
+        try:
+            os.makedirs(Path(destination, rel_dir), exist_ok=True)
+            stats.created_dir_count += 1
+        except OSError as e:
+            stats.error_lst.append((rel_dir, str(e)))
+
+    # Hard link what did not change (cheap metadata operations, done in place)
+    copy_lst: List[Tuple[str, os.stat_result]] = []
+    for rel_path, src_stat in src_file_dict.items():
+        prev_stat = prev_file_dict.get(rel_path)
+        if (prev_stat is not None and prev_stat.st_size == src_stat.st_size and
+                prev_stat.st_mode == src_stat.st_mode and
+                abs(prev_stat.st_mtime_ns - src_stat.st_mtime_ns) <= window_ns):
+            try:
+                os.link(Path(link_dest, rel_path), Path(destination, rel_path))
+                stats.linked_count += 1
+                continue
+            except OSError:
+                pass  # Copy instead
+        copy_lst.append((rel_path, src_stat))
+
+    def copy_task(item) -> Optional[str]:
+        rel_path, src_stat = item
+        try:
+            _copy_file_with_metadata(Path(source, rel_path), Path(destination, rel_path), src_stat)
+        except OSError as e:
+            return str(e)
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='fileUtils.snapshot') as executor:
+        for (rel_path, src_stat), error in zip(copy_lst, executor.map(copy_task, copy_lst)):
+            if error is None:
+                stats.copied_count += 1
+                stats.copied_bytes += src_stat.st_size
+            else:
+                stats.error_lst.append((rel_path, error))
+
+    for rel_path, error in stats.error_lst:
+        log(Severity.ERROR, tool_name, f'"{rel_path}": {error}')
+    log(Severity.DEBUG, tool_name, f'Snapshot of "{source}" to "{destination}": {stats}')
+    return stats
+
+
+def _scan_tree_stats(root: Path, scan_filter: Optional[ScanFilter],
+                     parallel: int) -> Tuple[Dict[str, os.stat_result], Set[str]]:
+    """
+    Returns ({relative file path: stat}, {relative folder paths}) of a tree, '/' separated, root excluded.
+    """
+    file_dict: Dict[str, os.stat_result] = {}
+    dir_set: Set[str] = set()
+    for current_dir, file_entry_lst in iter_dir_listings(root, parallel=parallel, scan_filter=scan_filter):
+        prefix = ''
+        if current_dir != root:
+            rel_dir = current_dir.relative_to(root).as_posix()
+            dir_set.add(rel_dir)
+            prefix = rel_dir + '/'
+        for entry in file_entry_lst:
+            try:
+                file_dict[prefix + entry.name] = entry.stat()
+            except FileNotFoundError:  # Broken link
+                continue
+    return file_dict, dir_set
+
+
+def copy_file_contents(source: Union[str, Path], destination: Union[str, Path],
+                       progress_callback: Optional[Callable[[int], None]] = None):
+    """
+    Copies the contents of a file (like shutil.copyfile, raises OSError on failure), as fast as the OS allows.
+
+    On Linux, in order:
+    1. Reflink (FICLONE): the copy shares the blocks of the source (btrfs, xfs...), instant whatever the size.
+    2. os.copy_file_range (then os.sendfile, then read/write) in large chunks, in the kernel (no user-space buffer).
+       Only the data segments of sparse files are copied (SEEK_DATA / SEEK_HOLE), holes stay holes. Whatever the
+       source gained during the copy is copied too (up to end of file).
+    Files that are not regular or report a size of 0 (procfs, sysfs, some FUSE mounts) are read until end of file.
+    Elsewhere, shutil.copyfile (native copy) is used, or a buffered copy when progress is requested.
+
+    :param progress_callback: Called with the number of bytes copied so far
+    """
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise SameFileError(f'{source!r} and {destination!r} are the same file')
+
+    if get_os() != OS.LINUX:
+        if progress_callback is None:
+            copyfile(source, destination)
+        else:
+            _copy_file_buffered(source, destination, progress_callback)
+        return
+
+    with open(source, 'rb') as fsrc, open(destination, 'wb') as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        src_stat = os.fstat(src_fd)
+        size = src_stat.st_size
+        if size == 0 or not stat.S_ISREG(src_stat.st_mode):  # Size unknown in advance
+            _copy_until_eof(fsrc, fdst, progress_callback, pseudo_file_buffer_size)
+            return
+
+        # 1. Reflink
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            if progress_callback is not None:
+                progress_callback(size)
+            return
+        except OSError:
+            pass
+
+        # 2. Data segments, through the kernel
+        os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        copied = 0
+        pos = 0
+        sparse_aware = hasattr(os, 'SEEK_DATA')
+        while pos < size:
+            data_start, data_end = pos, size
+            if sparse_aware:
+                try:
+                    data_start = os.lseek(src_fd, pos, os.SEEK_DATA)
+                    data_end = os.lseek(src_fd, data_start, os.SEEK_HOLE)
+                except OSError as e:
+                    if e.errno == errno.ENXIO:
+                        break  # Only a hole left
+                    sparse_aware = False  # File system does not support it: copy everything
+                    data_start, data_end = pos, size
+
+            for chunk_size in _copy_range(src_fd, dst_fd, data_start, data_end):
+                copied += chunk_size
+                if progress_callback is not None:
+                    progress_callback(copied)
+            pos = data_end
+
+        # Bytes appended to the source since fstat, until the kernel reports end of file
+        end = size
+        for chunk_size in _copy_range(src_fd, dst_fd, size, sys.maxsize):
+            end += chunk_size
+            copied += chunk_size
+            if progress_callback is not None:
+                progress_callback(copied)
+
+        os.ftruncate(dst_fd, end)  # Trailing hole
+
+
+def _copy_range(src_fd: int, dst_fd: int, start: int, end: int) -> Iterator[int]:
+    """
+    Copies bytes [start:end] of src_fd at the same offset in dst_fd; yields the size of every chunk copied.
+    Falls back from copy_file_range to sendfile to pread/write as the kernel / file systems refuse.
+    """
+    pos = start
+    # copy_file_range (EXDEV across file systems on older kernels, ENOSYS/EINVAL/EOPNOTSUPP on some others)
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while pos < end:
+                sent = os.copy_file_range(src_fd, dst_fd, min(copy_chunk_size, end - pos), pos, pos)
+                if sent == 0:
+                    break  # Some pseudo file systems report 0: finish with another method
+                pos += sent
+                yield sent
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                raise
+
+    # sendfile (writes at the current offset of dst_fd)
+    if pos < end:
+        try:
+            os.lseek(dst_fd, pos, os.SEEK_SET)
+            while pos < end:
+                sent = os.sendfile(dst_fd, src_fd, pos, min(copy_chunk_size, end - pos))
+                if sent == 0:
+                    break
+                pos += sent
+                yield sent
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+
+    # Plain read / write
+    while pos < end:
+        data = os.pread(src_fd, min(copy_chunk_size, end - pos), pos)
+        if not data:
+            break  # Source got shorter while copying
+        os.pwrite(dst_fd, data, pos)
+        pos += len(data)
+        yield len(data)
+
+
+def _copy_file_buffered(source: Union[str, Path], destination: Union[str, Path],
+                        progress_callback: Callable[[int], None]):
+    with open(source, 'rb', buffering=0) as fsrc, open(destination, 'wb') as fdst:
+        _copy_until_eof(fsrc, fdst, progress_callback, copy_chunk_size)
+
+
+def _copy_until_eof(fsrc: BinaryIO, fdst: BinaryIO, progress_callback: Optional[Callable[[int], None]],
+                    buffer_size: int):
+    """
+    Copies from a file object to another through a buffer until end of file, whatever size the source reports.
+    """
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    copied = 0
+    while True:
+        read_size = fsrc.readinto(buffer)
+        if not read_size:
+            break
+        fdst.write(view[:read_size])
+        copied += read_size
+        if progress_callback is not None:
+            progress_callback(copied)
+
+
+FICLONE = 0x40049409  # Linux ioctl: share the blocks of another file (reflink)
+copy_chunk_size: int = 64 * 1024 * 1024
+pseudo_file_buffer_size: int = 1024 * 1024  # Buffer for sources whose size is unknown (procfs, sysfs, pipes...)
+
+
+@contextmanager
+def atomic_open(path: Union[str, Path], mode: str = 'w', encoding: Optional[str] = None, fsync: bool = False):
+    """
+    Opens a temporary file next to path for writing; on success it replaces path in one step (os.replace),
+    on error it is discarded and path is left untouched. Permissions and owner / group (when allowed) of the replaced
+    file are kept, and a symbolic link at path keeps pointing to the (replaced) target. Hard links are not kept: other
+    names of the file still hold the old contents.
+
+    with atomic_open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+    :param fsync: Flush the data (and the directory entry) to disk before returning
+    """
+    target = Path(os.path.realpath(path)) if os.path.islink(path) else Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.', suffix='.tmp')
+    try:
+        with open(fd, mode, encoding=encoding, buffering=txt_io_buffer_size) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        # mkstemp creates the file as 0o600, owned by us: use the owner and permissions of the file being replaced
+        # (or the default ones)
+        try:
+            target_stat = os.stat(target)
+        except FileNotFoundError:
+            os.chmod(tmp_name, 0o666 & ~_get_umask())
+        else:
+            if hasattr(os, 'chown'):
+                try:
+                    os.chown(tmp_name, target_stat.st_uid, target_stat.st_gid)  # Before chmod (clears setuid bits)
+                except PermissionError:
+                    pass  # Only root can give a file away
+            os.chmod(tmp_name, stat.S_IMODE(target_stat.st_mode))
+
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    if fsync and get_os() != OS.WIN:
+        dir_fd = os.open(target.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _get_umask() -> int:
+    """
+    Process umask, without changing it (other threads may be creating files): Linux reports it in /proc/self/status,
+    elsewhere the value read once at import is used.
+    """
+    if get_os() == OS.LINUX:
+        try:
+            with open('/proc/self/status', encoding='ascii', errors='replace') as f:
+                for line in f:
+                    if line.startswith('Umask:'):
+                        return int(line.split()[1], 8)
+        except (OSError, ValueError, IndexError):
+            pass
+    return _import_umask
+
+
+def _read_umask_once() -> int:
+    umask = os.umask(0o022)  # Only way to read it: set, then restore (at import, before worker threads exist)
+    os.umask(umask)
+    return umask
+
+
+_import_umask: int = _read_umask_once()
+
+
 def make_dir(directory):
     """
     Creates directory at location (if it doesn't exist)
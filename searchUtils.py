@@ -0,0 +1,270 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# AUTHORSHIP INFORMATION - THIS FILE BELONGS TO MARC-ANDRE VOYER HELPER FUNCTIONS CODEBASE
+
+__author__ = 'Marc-André Voyer'
+__copyright__ = 'Copyright (C) 2020-2026, Marc-André Voyer'
+__license__ = "MIT License"
+__maintainer__ = 'Marc-André Voyer'
+__email__ = 'marcandre.voyer@gmail.com'
+__status__ = 'Production'
+
+# ----------------------------------------------------------------------------------------------------------------------
+# IMPORTS
+
+
+"""
+Search (grep) and search-and-replace over text files of a directory tree.
+Files are memory-mapped and scanned with a compiled bytes regex; trees are split in batches across a pool of worker
+processes (the regex engine holds the GIL, so threads would not run searches in parallel).
+"""
+
+from typing import *
+from pathlib import Path
+import os
+import re
+import mmap
+from concurrent.futures import ProcessPoolExecutor, Future
+
+# Common utilities
+from . import fileUtils
+from .debugUtils import *
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# SETTINGS
+
+sniff_size: int = 8192  # First block checked for NUL bytes; files having one are binary and skipped
+batch_size: int = 64  # Maximum files per worker task
+batch_bytes: int = 16 * 1024 * 1024  # A batch is closed once its files add up to this size
+count_chunk_size: int = 1024 * 1024  # Bytes copied at a time when counting lines up to a match
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# CODE
+
+class SearchMatch:
+    """
+    One match: file, line number (1-based), line text (without line ending), matched text and byte offset in the file.
+    """
+    __slots__ = ('path', 'line_number', 'line', 'match', 'offset')
+
+    def __init__(self, path: Path, line_number: int, line: str, match: str, offset: int):
+        self.path = path
+        self.line_number = line_number
+        self.line = line
+        self.match = match
+        self.offset = offset
+
+    def __repr__(self):
+        return f'{self.path}:{self.line_number}: {self.line}'
+
+
+def compile_pattern(pattern: Union[str, bytes, re.Pattern], fixed_string: bool = False, ignore_case: bool = False,
+                    encoding: str = 'utf-8') -> re.Pattern:
+    """
+    Returns the bytes regex to search with (^ and $ match at every line).
+    A compiled pattern keeps its own flags, the options below are added to them.
+    :param fixed_string: Search the text as is (not as a regular expression)
+    """
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    if isinstance(pattern, re.Pattern):
+        flags |= pattern.flags & ~re.UNICODE  # str patterns are implicitly UNICODE, invalid for bytes
+        pattern = pattern.pattern
+    if isinstance(pattern, str):
+        pattern = pattern.encode(encoding)
+    if fixed_string:
+        pattern = re.escape(pattern)
+    return re.compile(pattern, flags)
+
+
+def is_binary(head: bytes) -> bool:
+    """
+    Whether a file is binary, from its first block (same heuristic as git / grep: it holds a NUL byte).
+    UTF-16 / UTF-32 text files are therefore treated as binary.
+    """
+    return b'\0' in head
+
+
+def search_file(path: Union[str, Path], pattern: re.Pattern, encoding: str = 'utf-8',
+                max_count: Optional[int] = None) -> List[SearchMatch]:
+    """
+    Returns the matches of a compiled bytes pattern in a file ([] for binary, empty or unreadable files).
+    """
+    path = Path(path)
+    match_lst: List[SearchMatch] = []
+    try:
+        with open(path, 'rb') as f:
+            if is_binary(f.read(sniff_size)) or os.fstat(f.fileno()).st_size == 0:
+                return match_lst
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                line_number = 1
+                counted_pos = 0
+                for found in pattern.finditer(mapped):
+                    start = found.start()
+                    line_number += _count_newlines(mapped, counted_pos, start)
+                    counted_pos = start
+                    line_start = mapped.rfind(b'\n', 0, start) + 1
+                    line_end = mapped.find(b'\n', start)
+                    if line_end == -1:
+                        line_end = len(mapped)
+                    line = mapped[line_start:line_end].rstrip(b'\r').decode(encoding, errors='replace')
+                    match_lst.append(SearchMatch(path, line_number, line,
+                                                 found.group().decode(encoding, errors='replace'), start))
+                    if max_count is not None and len(match_lst) >= max_count:
+                        break
+    except (OSError, ValueError) as e:
+        log(Severity.DEBUG, 'searchUtils.search_file', f'Skipping "{path}": {e}')
+    return match_lst
+
+
+def _count_newlines(mapped: mmap.mmap, start: int, end: int) -> int:
+    """
+    Counts the line feeds between two offsets of a mapped file, a bounded chunk at a time (never copies the gap).
+    """
+    count = 0
+    for pos in range(start, end, count_chunk_size):
+        count += mapped[pos:min(pos + count_chunk_size, end)].count(b'\n')
+    return count
+
+
+def replace_in_file(path: Union[str, Path], pattern: re.Pattern, replacement: bytes, dry_run: bool = False) -> int:
+    """
+    Replaces every match of a compiled bytes pattern in a file (replacement may use \\1 / \\g<name>). The file is only
+    rewritten when something matched, atomically (fileUtils.atomic_open). Returns the number of replacements.
+    """
+    path = Path(path)
+    try:
+        with open(path, 'rb') as f:
+            if is_binary(f.read(sniff_size)) or os.fstat(f.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if pattern.search(mapped) is None:
+                    return 0
+                new_data, count = pattern.subn(replacement, mapped)
+    except (OSError, ValueError) as e:
+        log(Severity.DEBUG, 'searchUtils.replace_in_file', f'Skipping "{path}": {e}')
+        return 0
+
+    if count and not dry_run:
+        # Map closed first: Windows cannot replace a mapped file
+        with fileUtils.atomic_open(path, 'wb') as f:
+            f.write(new_data)
+    return count
+
+
+def search_tree(dir_name: Union[str, Path], pattern: Union[str, bytes, re.Pattern], fixed_string: bool = False,
+                ignore_case: bool = False, extensions: Iterable[str] = (),
+                scan_filter: Optional[fileUtils.ScanFilter] = None, workers: int = 0, encoding: str = 'utf-8',
+                max_count: Optional[int] = None) -> Iterator[SearchMatch]:
+    """
+    Yields the matches of a pattern in the (text) files of a tree, as they are found, in scan order
+    (see fileUtils.iter_files). Binary files are skipped.
+
+    :param pattern: Regular expression (str is encoded with encoding) or, with fixed_string, plain text
+    :param extensions: Only search files with these extensions (e.g. ['ini', 'xml', 'txt'])
+    :param scan_filter: fileUtils.ScanFilter applied during the scan (cannot be combined with extensions)
+    :param workers: Number of worker processes (0 or 1: search in this process)
+    :param max_count: Maximum matches per file
+    """
+    compiled = compile_pattern(pattern, fixed_string, ignore_case, encoding)
+    for match_lst in _run_batches(dir_name, extensions, scan_filter, workers, _search_batch,
+                                  (compiled, encoding, max_count)):
+        yield from match_lst
+
+
+def replace_in_tree(dir_name: Union[str, Path], pattern: Union[str, bytes, re.Pattern],
+                    replacement: Union[str, bytes], fixed_string: bool = False, ignore_case: bool = False,
+                    extensions: Iterable[str] = (), scan_filter: Optional[fileUtils.ScanFilter] = None,
+                    workers: int = 0, encoding: str = 'utf-8', dry_run: bool = False) -> Dict[Path, int]:
+    """
+    Replaces a pattern in the (text) files of a tree. Only files with matches are rewritten (atomically, keeping
+    their permissions). Returns {changed file: number of replacements}. Same options as search_tree.
+
+    :param replacement: Replacement text (str is encoded with encoding); for a regex, \\1 / \\g<name> are expanded
+    :param dry_run: Only count what would be replaced
+    """
+    tool_name = 'searchUtils.replace_in_tree'
+    compiled = compile_pattern(pattern, fixed_string, ignore_case, encoding)
+    if isinstance(replacement, str):
+        replacement = replacement.encode(encoding)
+    if fixed_string:
+        replacement = replacement.replace(b'\\', b'\\\\')  # Literal replacement too
+
+    changed_dict: Dict[Path, int] = {}
+    for result_lst in _run_batches(dir_name, extensions, scan_filter, workers, _replace_batch,
+                                   (compiled, replacement, dry_run)):
+        changed_dict.update(result_lst)
+    log(Severity.DEBUG, tool_name, f'{sum(changed_dict.values())} replacement(s) in {len(changed_dict)} file(s)'
+                                   f'{" (dry run)" if dry_run else ""}')
+    return changed_dict
+
+
+def _search_batch(path_lst: List[Path], pattern: re.Pattern, encoding: str,
+                  max_count: Optional[int]) -> List[SearchMatch]:
+    match_lst: List[SearchMatch] = []
+    for path in path_lst:
+        match_lst.extend(search_file(path, pattern, encoding, max_count))
+    return match_lst
+
+
+def _replace_batch(path_lst: List[Path], pattern: re.Pattern, replacement: bytes,
+                   dry_run: bool) -> List[Tuple[Path, int]]:
+    result_lst: List[Tuple[Path, int]] = []
+    for path in path_lst:
+        count = replace_in_file(path, pattern, replacement, dry_run)
+        if count:
+            result_lst.append((path, count))
+    return result_lst
+
+
+def _iter_batches(dir_name: Union[str, Path], extensions: Iterable[str],
+                  scan_filter: Optional[fileUtils.ScanFilter]) -> Iterator[List[Path]]:
+    """
+    Groups the files of a tree in batches of at most batch_size files / about batch_bytes bytes.
+    """
+    extensions = list(extensions)
+    if extensions:
+        if scan_filter is not None:
+            log(Severity.CRITICAL, 'searchUtils', 'Give extensions through the scan_filter when using one')
+        scan_filter = fileUtils.ScanFilter(extensions=extensions)
+
+    batch: List[Path] = []
+    batch_total = 0
+    for current_dir, file_entry_lst in fileUtils.iter_dir_listings(dir_name, scan_filter=scan_filter):
+        for entry in file_entry_lst:
+            try:
+                batch_total += entry.stat().st_size
+            except OSError:  # Broken link
+                continue
+            batch.append(current_dir / entry.name)
+            if len(batch) >= batch_size or batch_total >= batch_bytes:
+                yield batch
+                batch = []
+                batch_total = 0
+    if batch:
+        yield batch
+
+
+def _run_batches(dir_name: Union[str, Path], extensions: Iterable[str], scan_filter: Optional[fileUtils.ScanFilter],
+                 workers: int, batch_func: Callable, args: tuple) -> Iterator[list]:
+    """
+    Runs batch_func(batch, *args) over the file batches of a tree and yields the results in scan order, with at most
+    2 batches per worker in flight.
+    """
+    batch_iter = _iter_batches(dir_name, extensions, scan_filter)
+    if workers <= 1:
+        for batch in batch_iter:
+            yield batch_func(batch, *args)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending_lst: List[Future] = []
+        for batch in batch_iter:
+            pending_lst.append(executor.submit(batch_func, batch, *args))
+            if len(pending_lst) >= workers * 2:
+                yield pending_lst.pop(0).result()
+        for future in pending_lst:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,357 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# AUTHORSHIP INFORMATION - THIS FILE BELONGS TO MARC-ANDRE VOYER HELPER FUNCTIONS CODEBASE
+
+__author__ = 'Marc-André Voyer'
+__copyright__ = 'Copyright (C) 2020-2026, Marc-André Voyer'
+__license__ = "MIT License"
+__maintainer__ = 'Marc-André Voyer'
+__email__ = 'marcandre.voyer@gmail.com'
+__status__ = 'Production'
+
+# ----------------------------------------------------------------------------------------------------------------------
+# IMPORTS
+
+
+"""
+Snapshots of directory trees: an on-disk index so repeated scans of (mostly) unchanged trees stay cheap,
+and captured tree states that can be diffed against each other.
+"""
+
+from typing import *
+from pathlib import Path
+import os
+import time
+import json
+import sqlite3
+
+# Common utilities
+from . import fileUtils
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# SETTINGS
+
+# A directory modified this recently may still change within the same mtime tick (FAT has a 2s resolution),
+# so its listing is stored but not trusted on the next scan.
+racy_window_ns: int = 2_000_000_000
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# CODE
+
+
+class SnapshotIndex:
+    """
+    SQLite index of a directory tree (path, type, size and mtime of every entry).
+
+    Scanning through the index only re-lists directories whose mtime changed since the last scan (adding, removing
+    or renaming an entry always bumps the mtime of its directory); the other listings come from the database.
+    The listing is therefore always the same as a fresh scan. Size / mtime stored for files are the ones from the
+    last time their directory was listed, the File objects returned read their own stat when asked.
+    """
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.listed_dir_count = 0  # Directories listed from disk on the last scan
+        self.reused_dir_count = 0  # Directories taken from the index on the last scan
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.__connection = sqlite3.connect(str(self.db_path))
+        self.__connection.executescript(
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'CREATE TABLE IF NOT EXISTS dirs ('
+            '    path BLOB PRIMARY KEY,'
+            '    mtime_ns INTEGER NOT NULL'
+            ') WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS entries ('
+            '    dir BLOB NOT NULL,'
+            '    name BLOB NOT NULL,'
+            '    is_dir INTEGER NOT NULL,'
+            '    size INTEGER,'
+            '    mtime_ns INTEGER,'
+            '    PRIMARY KEY (dir, name)'
+            ') WITHOUT ROWID;'
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.__connection.close()
+
+    def get_file_list_from_path(self, dir_name: Union[str, Path], recursive=True,
+                                filter_extension=None) -> List[fileUtils.File]:
+        """
+        Same result as fileUtils.get_file_list_from_path, but only re-lists directories that changed.
+        """
+        return list(self.iter_files(dir_name, recursive=recursive, filter_extension=filter_extension))
+
+    def iter_files(self, dir_name: Union[str, Path], recursive=True,
+                   filter_extension=None) -> Iterator[fileUtils.File]:
+        """
+        Same output (and order) as fileUtils.iter_files, but only re-lists directories that changed.
+        """
+        ext_filter = filter_extension.lower().lstrip('.') if filter_extension is not None else None
+
+        for current_dir, file_name_lst in self.iter_dir_listings(dir_name, recursive=recursive):
+            for file_name in file_name_lst:
+                if ext_filter is not None and fileUtils.get_name_ext(file_name) != ext_filter:
+                    continue
+                yield fileUtils.get_file_class(file_name)(current_dir / file_name)
+
+    def iter_dir_listings(self, dir_name: Union[str, Path], recursive=True) -> Iterator[Tuple[Path, List[str]]]:
+        """
+        Yields (directory, sorted file names) for every directory of a tree, in fileUtils.iter_files order.
+        The index is updated along the way (committed even if the iteration is stopped early).
+        """
+        self.listed_dir_count = 0
+        self.reused_dir_count = 0
+
+        dir_stack: List[Path] = [Path(dir_name)]
+        try:
+            while dir_stack:
+                current_dir = dir_stack.pop()
+                file_name_lst, sub_dir_name_lst = self.__get_listing(current_dir)
+                yield current_dir, file_name_lst
+                if recursive:
+                    dir_stack.extend(current_dir / name for name in reversed(sub_dir_name_lst))
+        finally:
+            self.__connection.commit()
+
+    def __get_listing(self, dir_path: Path) -> Tuple[List[str], List[str]]:
+        """
+        Returns (file names, sub-folder names) of a directory, sorted, from the index when still valid.
+        """
+        dir_key = os.fsencode(dir_path)
+        dir_mtime_ns = os.stat(dir_path).st_mtime_ns
+
+        row = self.__connection.execute('SELECT mtime_ns FROM dirs WHERE path = ?', (dir_key,)).fetchone()
+        if row is not None and row[0] == dir_mtime_ns:
+            self.reused_dir_count += 1
+            file_name_lst = []
+            sub_dir_name_lst = []
+            for name, is_dir in self.__connection.execute('SELECT name, is_dir FROM entries WHERE dir = ?',
+                                                          (dir_key,)):
+                (sub_dir_name_lst if is_dir else file_name_lst).append(os.fsdecode(name))
+            file_name_lst.sort()
+            sub_dir_name_lst.sort()
+            return file_name_lst, sub_dir_name_lst
+
+        # Changed (or never seen): list from disk and record it
+        self.listed_dir_count += 1
+        file_name_lst = []
+        sub_dir_name_lst = []
+        row_lst = []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    sub_dir_name_lst.append(entry.name)
+                    row_lst.append((dir_key, os.fsencode(entry.name), 1, None, None))
+                else:
+                    file_name_lst.append(entry.name)
+                    try:
+                        entry_stat = entry.stat()
+                        row_lst.append((dir_key, os.fsencode(entry.name), 0,
+                                        entry_stat.st_size, entry_stat.st_mtime_ns))
+                    except FileNotFoundError:  # Broken link
+                        row_lst.append((dir_key, os.fsencode(entry.name), 0, None, None))
+        file_name_lst.sort()
+        sub_dir_name_lst.sort()
+
+        # Forget sub-trees of folders that are gone
+        if row is not None:
+            old_sub_dir_lst = [os.fsdecode(name) for (name,) in self.__connection.execute(
+                'SELECT name FROM entries WHERE dir = ? AND is_dir = 1', (dir_key,))]
+            for name in set(old_sub_dir_lst).difference(sub_dir_name_lst):
+                self.__forget_subtree(os.fsencode(dir_path / name))
+
+        if time.time_ns() - dir_mtime_ns < racy_window_ns:
+            dir_mtime_ns = -1  # Too recent to be trusted next time
+
+        self.__connection.execute('DELETE FROM entries WHERE dir = ?', (dir_key,))
+        self.__connection.executemany('INSERT INTO entries VALUES (?, ?, ?, ?, ?)', row_lst)
+        self.__connection.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?)', (dir_key, dir_mtime_ns))
+        return file_name_lst, sub_dir_name_lst
+
+    def __forget_subtree(self, dir_key: bytes):
+        # Every key starting with "<dir><sep>" sorts between "<dir><sep>" and "<dir><sep + 1>"
+        sep = os.fsencode(os.sep)
+        low = dir_key + sep
+        high = dir_key + bytes([sep[0] + 1])
+        self.__connection.execute('DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)',
+                                  (dir_key, low, high))
+        self.__connection.execute('DELETE FROM entries WHERE dir = ? OR (dir >= ? AND dir < ?)',
+                                  (dir_key, low, high))
+
+
+class SnapshotEntry:
+    """
+    State of one file in a TreeSnapshot.
+    """
+    __slots__ = ('size', 'mtime_ns', 'dev', 'inode', 'hash')
+
+    def __init__(self, size: int, mtime_ns: int, dev: int, inode: int, hash: Optional[str] = None):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.dev = dev
+        self.inode = inode
+        self.hash = hash
+
+    def to_list(self) -> list:
+        return [self.size, self.mtime_ns, self.dev, self.inode, self.hash]
+
+    def is_modified(self, other: 'SnapshotEntry') -> bool:
+        """
+        Whether the content differs from another entry. Hashes win when both sides have one.
+        """
+        if self.hash is not None and other.hash is not None:
+            return self.hash != other.hash
+        return self.size != other.size or self.mtime_ns != other.mtime_ns
+
+
+class TreeSnapshot:
+    """
+    State of every file under a root directory, keyed by path relative to the root ('/' separated).
+    """
+    def __init__(self, root: Union[str, Path], entry_dict: Optional[Dict[str, SnapshotEntry]] = None):
+        self.root = Path(root)
+        self.entry_dict: Dict[str, SnapshotEntry] = entry_dict if entry_dict is not None else {}
+
+    def __len__(self):
+        return len(self.entry_dict)
+
+    def save(self, path: Union[str, Path]):
+        """
+        Saves the snapshot to a JSON file, to diff against on a later run.
+        """
+        data = {'root': str(self.root),
+                'entries': {rel_path: entry.to_list() for rel_path, entry in self.entry_dict.items()}}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    @staticmethod
+    def load(path: Union[str, Path]) -> 'TreeSnapshot':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entry_dict = {rel_path: SnapshotEntry(*values) for rel_path, values in data['entries'].items()}
+        return TreeSnapshot(data['root'], entry_dict)
+
+    @staticmethod
+    def from_files(root: Union[str, Path], file_lst: Iterable[fileUtils.File]) -> 'TreeSnapshot':
+        """
+        Builds a snapshot from File objects (e.g. the result of fileUtils.get_file_list_from_path).
+        """
+        root = Path(root)
+        entry_dict = {}
+        for file in file_lst:
+            file_stat = file.stat()
+            if file_stat is None:
+                continue
+            rel_path = file.path.relative_to(root).as_posix()
+            entry_dict[rel_path] = SnapshotEntry(file_stat.st_size, file_stat.st_mtime_ns,
+                                                 file_stat.st_dev, file_stat.st_ino)
+        return TreeSnapshot(root, entry_dict)
+
+
+class SnapshotDiff:
+    """
+    Difference between two TreeSnapshot (relative paths). Renamed holds (old path, new path) pairs.
+    """
+    def __init__(self):
+        self.added: List[str] = []
+        self.deleted: List[str] = []
+        self.modified: List[str] = []
+        self.renamed: List[Tuple[str, str]] = []
+
+    def __bool__(self):
+        return bool(self.added or self.deleted or self.modified or self.renamed)
+
+    def __repr__(self):
+        return (f'SnapshotDiff(added={len(self.added)}, deleted={len(self.deleted)}, '
+                f'modified={len(self.modified)}, renamed={len(self.renamed)})')
+
+
+def capture_snapshot(dir_name: Union[str, Path], hash_algo: Optional[str] = None,
+                     parallel: int = 0) -> TreeSnapshot:
+    """
+    Captures the state of every file under a directory.
+
+    :param dir_name: Root directory of the snapshot
+    :param hash_algo: hashlib algorithm name to also fingerprint contents (e.g. 'sha256'); None = size/mtime only
+    :param parallel: Number of threads listing directories (see fileUtils.iter_dir_listings)
+    """
+    root = Path(dir_name)
+    entry_dict: Dict[str, SnapshotEntry] = {}
+
+    for current_dir, file_entry_lst in fileUtils.iter_dir_listings(root, parallel=parallel):
+        rel_dir = current_dir.relative_to(root).as_posix()
+        prefix = '' if rel_dir == '.' else rel_dir + '/'
+        for entry in file_entry_lst:
+            try:
+                entry_stat = entry.stat()
+            except FileNotFoundError:  # Broken link / removed during the scan
+                continue
+            file_hash = None
+            if hash_algo is not None:
+                file_hash = fileUtils.File(Path(entry.path), entry_stat).hash(hash_algo)  # Cached by inode/mtime
+            entry_dict[prefix + entry.name] = SnapshotEntry(entry_stat.st_size, entry_stat.st_mtime_ns,
+                                                            entry_stat.st_dev, entry_stat.st_ino, file_hash)
+
+    return TreeSnapshot(root, entry_dict)
+
+
+def diff_snapshots(old: TreeSnapshot, new: TreeSnapshot) -> SnapshotDiff:
+    """
+    Computes what changed from an old snapshot to a new one, in linear time (dictionary lookups, no pair matching).
+    A deleted path whose inode shows up again under an added path is reported as renamed (and also as modified,
+    under its new path, if its content changed).
+    """
+    diff = SnapshotDiff()
+    old_dict = old.entry_dict
+    new_dict = new.entry_dict
+
+    for rel_path, new_entry in new_dict.items():
+        old_entry = old_dict.get(rel_path)
+        if old_entry is None:
+            diff.added.append(rel_path)
+        elif old_entry.is_modified(new_entry):
+            diff.modified.append(rel_path)
+
+    for rel_path in old_dict:
+        if rel_path not in new_dict:
+            diff.deleted.append(rel_path)
+
+    # Pair deleted and added paths sharing an inode (inode 0 means the file system does not provide one)
+    if diff.added and diff.deleted:
+        added_by_inode: Dict[Tuple[int, int], str] = {}
+        for rel_path in diff.added:
+            entry = new_dict[rel_path]
+            if entry.inode:
+                added_by_inode[(entry.dev, entry.inode)] = rel_path
+
+        still_deleted = []
+        renamed_new_set = set()
+        for rel_path in diff.deleted:
+            old_entry = old_dict[rel_path]
+            new_path = added_by_inode.pop((old_entry.dev, old_entry.inode), None) if old_entry.inode else None
+            if new_path is None:
+                still_deleted.append(rel_path)
+                continue
+            diff.renamed.append((rel_path, new_path))
+            renamed_new_set.add(new_path)
+            if old_entry.is_modified(new_dict[new_path]):
+                diff.modified.append(new_path)
+
+        diff.deleted = still_deleted
+        diff.added = [rel_path for rel_path in diff.added if rel_path not in renamed_new_set]
+
+    diff.added.sort()
+    diff.deleted.sort()
+    diff.modified.sort()
+    diff.renamed.sort()
+    return diff
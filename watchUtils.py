@@ -0,0 +1,354 @@
+# ----------------------------------------------------------------------------------------------------------------------
+# AUTHORSHIP INFORMATION - THIS FILE BELONGS TO MARC-ANDRE VOYER HELPER FUNCTIONS CODEBASE
+
+__author__ = 'Marc-André Voyer'
+__copyright__ = 'Copyright (C) 2020-2026, Marc-André Voyer'
+__license__ = "MIT License"
+__maintainer__ = 'Marc-André Voyer'
+__email__ = 'marcandre.voyer@gmail.com'
+__status__ = 'Production'
+
+# ----------------------------------------------------------------------------------------------------------------------
+# IMPORTS
+
+
+"""
+Live watcher of a directory tree: keeps a TreeSnapshot up to date and reports batched changes.
+Uses inotify (through ctypes) on Linux, polls elsewhere.
+"""
+
+from typing import *
+from pathlib import Path
+import os
+import stat
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+
+# Common utilities
+from .osUtils import *
+from .debugUtils import *
+from .snapshotUtils import TreeSnapshot, SnapshotEntry, SnapshotDiff, capture_snapshot, diff_snapshots
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# INOTIFY CONSTANTS
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF)
+
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len (then name, NUL padded)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# CODE
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    if get_os() != OS.LINUX:
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        for func_name in ('inotify_init1', 'inotify_add_watch', 'inotify_rm_watch'):
+            getattr(libc, func_name)
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+class TreeWatcher:
+    """
+    Watches a directory tree and keeps `snapshot` (a TreeSnapshot of every file) current.
+
+    Events are coalesced: once the tree has been quiet for `debounce` seconds (or after `max_delay` seconds of
+    continuous activity), the touched paths are stat-ed once each and `callback` receives a single SnapshotDiff.
+    On Linux, inotify is used (one watch per directory); otherwise (or with force_polling), the tree is
+    re-captured every `poll_interval` seconds.
+    """
+    def __init__(self, dir_name: Union[str, Path], callback: Callable[[SnapshotDiff], None],
+                 debounce: float = 0.2, max_delay: float = 2.0, poll_interval: float = 2.0,
+                 force_polling: bool = False):
+        self.root = Path(dir_name)
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.snapshot = TreeSnapshot(self.root)
+
+        self.__libc = None if force_polling else _load_inotify()
+        self.__fd = -1
+        self.__wd_dict: Dict[int, Path] = {}  # Watch descriptor -> watched directory
+        self.__path_wd_dict: Dict[Path, int] = {}
+        self.__orphan_wd_set: Set[int] = set()  # Watches of directories that moved away (removed after flush)
+        self.__dirty_path_set: Set[Path] = set()
+        self.__dirty_dir_set: Set[Path] = set()
+
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()  # Held while `snapshot` is being updated
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.__libc is not None
+
+    def start(self):
+        """
+        Builds the initial snapshot (and watches), then starts watching on a background thread.
+        """
+        if self.__libc is not None:
+            self.__fd = self.__libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self.__fd < 0:
+                err = ctypes.get_errno()
+                log(Severity.WARNING, 'TreeWatcher', f'inotify unavailable ({os.strerror(err)}), polling instead')
+                self.__libc = None
+
+        if self.__libc is not None:
+            self.snapshot = TreeSnapshot(self.root, self.__watch_and_scan(self.root))
+            target = self.__run_inotify
+        else:
+            self.snapshot = capture_snapshot(self.root)
+            target = self.__run_polling
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=target, name='TreeWatcher', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        if self.__fd >= 0:
+            os.close(self.__fd)
+            self.__fd = -1
+            self.__wd_dict.clear()
+            self.__path_wd_dict.clear()
+            self.__orphan_wd_set.clear()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # POLLING
+
+    def __run_polling(self):
+        while not self.__stop_event.wait(self.poll_interval):
+            try:
+                new_snapshot = capture_snapshot(self.root)
+            except FileNotFoundError:
+                new_snapshot = TreeSnapshot(self.root)
+            except OSError as e:  # Unreadable folder: keep the last snapshot, try again next time
+                log(Severity.WARNING, 'TreeWatcher', f'Could not scan "{self.root}": {e}')
+                continue
+            diff = diff_snapshots(self.snapshot, new_snapshot)
+            with self.lock:
+                self.snapshot = new_snapshot
+            if diff:
+                self.__notify(diff)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # INOTIFY
+
+    def __run_inotify(self):
+        first_event_time = None
+        while not self.__stop_event.is_set():
+            timeout = self.debounce if first_event_time is not None else 0.5
+            ready, _, _ = select.select([self.__fd], [], [], timeout)
+            now = time.monotonic()
+            if ready:
+                self.__read_events()
+                if first_event_time is None:
+                    first_event_time = now
+                if now - first_event_time < self.max_delay:
+                    continue
+            if first_event_time is not None and (self.__dirty_path_set or self.__dirty_dir_set):
+                try:
+                    self.__flush()
+                except Exception as e:  # One bad path must not end the watcher thread
+                    log(Severity.ERROR, 'TreeWatcher', f'Could not update the index: {e}')
+            first_event_time = None
+
+    def __read_events(self):
+        while True:
+            try:
+                buffer = os.read(self.__fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, name_len = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + name_len].rstrip(b'\0')
+                offset += name_len
+                self.__handle_event(wd, mask, os.fsdecode(name))
+
+    def __handle_event(self, wd: int, mask: int, name: str):
+        if mask & IN_Q_OVERFLOW:
+            self.__dirty_dir_set.add(self.root)  # Events were lost: rescan everything
+            return
+
+        dir_path = self.__wd_dict.get(wd)
+        if dir_path is None:
+            return  # Watch removed / moved away
+        if mask & IN_IGNORED:
+            self.__forget_watch(wd)
+            return
+
+        path = dir_path / name if name else dir_path
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            if path == self.root:
+                self.__dirty_dir_set.add(self.root)
+            return
+        if mask & IN_ISDIR:
+            if mask & (IN_MOVED_FROM | IN_DELETE):
+                self.__orphan_watches(path)
+                self.__dirty_dir_set.add(path)
+            elif mask & (IN_MOVED_TO | IN_CREATE):
+                self.__dirty_dir_set.add(path)
+            return
+        self.__dirty_path_set.add(path)
+
+    def __flush(self):
+        """
+        Stats every touched path once, updates the snapshot and calls back with the resulting diff.
+        """
+        dirty_dir_lst = sorted(self.__dirty_dir_set)
+        dirty_path_lst = list(self.__dirty_path_set)
+        self.__dirty_dir_set.clear()
+        self.__dirty_path_set.clear()
+
+        old_dict: Dict[str, SnapshotEntry] = {}
+        new_dict: Dict[str, SnapshotEntry] = {}
+
+        if dirty_dir_lst:
+            prefix_tuple = tuple('' if p == self.root else self.__rel_key(p) + '/' for p in dirty_dir_lst)
+            for rel_path, entry in self.snapshot.entry_dict.items():
+                if rel_path.startswith(prefix_tuple):
+                    old_dict[rel_path] = entry
+            for dir_path in dirty_dir_lst:
+                if os.path.isdir(dir_path):
+                    new_dict.update(self.__watch_and_scan(dir_path))
+
+        for path in dirty_path_lst:
+            rel_path = self.__rel_key(path)
+            old_entry = self.snapshot.entry_dict.get(rel_path)
+            if old_entry is not None:
+                old_dict[rel_path] = old_entry
+            try:
+                path_stat = os.stat(path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            except OSError as e:
+                log(Severity.WARNING, 'TreeWatcher', f'Could not stat "{path}": {e}')
+                continue
+            if not stat.S_ISDIR(path_stat.st_mode):
+                new_dict[rel_path] = SnapshotEntry(path_stat.st_size, path_stat.st_mtime_ns,
+                                                   path_stat.st_dev, path_stat.st_ino)
+
+        for wd in self.__orphan_wd_set:
+            self.__libc.inotify_rm_watch(self.__fd, wd)
+        self.__orphan_wd_set.clear()
+
+        diff = diff_snapshots(TreeSnapshot(self.root, old_dict), TreeSnapshot(self.root, new_dict))
+        with self.lock:
+            for rel_path in old_dict:
+                del self.snapshot.entry_dict[rel_path]
+            self.snapshot.entry_dict.update(new_dict)
+        if diff:
+            self.__notify(diff)
+
+    def __watch_and_scan(self, dir_path: Path) -> Dict[str, SnapshotEntry]:
+        """
+        Watches every directory of a sub-tree and returns its files. Each directory is watched before being
+        listed, so nothing created in between can be missed.
+        """
+        entry_dict: Dict[str, SnapshotEntry] = {}
+        dir_stack = [dir_path]
+        while dir_stack:
+            current_dir = dir_stack.pop()
+            if not self.__add_watch(current_dir):
+                continue
+            prefix = '' if current_dir == self.root else self.__rel_key(current_dir) + '/'
+            try:
+                with os.scandir(current_dir) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            dir_stack.append(Path(entry.path))
+                            continue
+                        try:
+                            entry_stat = entry.stat()
+                        except OSError:  # Gone since / broken link / no access
+                            continue
+                        entry_dict[prefix + entry.name] = SnapshotEntry(entry_stat.st_size, entry_stat.st_mtime_ns,
+                                                                        entry_stat.st_dev, entry_stat.st_ino)
+            except (FileNotFoundError, NotADirectoryError):
+                continue  # Gone since; its own event will follow
+            except OSError as e:
+                log(Severity.WARNING, 'TreeWatcher', f'Could not list "{current_dir}": {e}')
+        return entry_dict
+
+    def __add_watch(self, dir_path: Path) -> bool:
+        wd = self.__libc.inotify_add_watch(self.__fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                log(Severity.ERROR, 'TreeWatcher', 'inotify watch limit reached '
+                                                   '(raise fs.inotify.max_user_watches); changes will be missed')
+            elif err in (errno.EACCES, errno.EPERM):
+                log(Severity.WARNING, 'TreeWatcher', f'No access to "{dir_path}", not watched')
+                return False
+            return err not in (errno.ENOENT, errno.ENOTDIR)
+        self.__wd_dict[wd] = dir_path
+        self.__path_wd_dict[dir_path] = wd
+        self.__orphan_wd_set.discard(wd)
+        return True
+
+    def __orphan_watches(self, dir_path: Path):
+        """
+        A directory moved away or got deleted: its watches (and those below) no longer map to valid paths.
+        If it re-appears inside the tree, re-watching it gives back the same watch descriptor.
+        """
+        for path in [p for p in self.__path_wd_dict if p == dir_path or dir_path in p.parents]:
+            wd = self.__path_wd_dict.pop(path)
+            self.__wd_dict.pop(wd, None)
+            self.__orphan_wd_set.add(wd)
+
+    def __forget_watch(self, wd: int):
+        path = self.__wd_dict.pop(wd)
+        if self.__path_wd_dict.get(path) == wd:
+            del self.__path_wd_dict[path]
+        self.__orphan_wd_set.discard(wd)
+
+    def __rel_key(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def __notify(self, diff: SnapshotDiff):
+        try:
+            self.callback(diff)
+        except Exception as e:
+            log(Severity.ERROR, 'TreeWatcher', f'Change callback failed: {e}')
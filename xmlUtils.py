@@ -13,11 +13,17 @@ __status__ = 'Production'
 
 from typing import *
 from pathlib import Path
+import os
 
 # Common utilities
 from . import fileUtils
 
 
 class XMLFile(fileUtils.TXTFile):
-    def __init__(self, path: Path):
-        super().__init__(path)
+    __slots__ = ()
+
+    def __init__(self, path: Path, stat_info: Union[os.stat_result, os.DirEntry, None] = None):
+        super().__init__(path, stat_info)
+
+
+fileUtils.register_file_type(XMLFile, extensions=['xml'], magic=[b'<?xml', b'\xef\xbb\xbf<?xml'])
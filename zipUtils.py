@@ -30,9 +30,11 @@ from .debugUtils import *
 
 
 class ZIPFile(fileUtils.File):
-    def __init__(self, path: Path):
+    __slots__ = ()
+
+    def __init__(self, path: Path, stat_info: Union[os.stat_result, os.DirEntry, None] = None):
         # Call the parent (File) initializer
-        super().__init__(path)
+        super().__init__(path, stat_info)
 
     def extract(self, dest_path: Path) -> bool:
         """Extract the CBZ File"""
@@ -47,6 +49,9 @@ class ZIPFile(fileUtils.File):
             log(Severity.CRITICAL, "CBZFile", f"Invalid ZIP structure in {self.path}")
 
 
+fileUtils.register_file_type(ZIPFile, extensions=['zip'], magic=[b'PK\x03\x04', b'PK\x05\x06'])
+
+
 def unzip_file(source_file: Union[str, Path],
                destination_dir: Union[str, Path],
                pwd: Optional[str] = None) -> bool: